@@ -1,8 +1,289 @@
 # PyInstaller hook for pyopenms
 # Collect the entire package (dylibs, data files, hidden imports) so that the
-# bundled macOS app ships every dependency required by libOpenMS and Qt.
+# bundled app ships every dependency required by libOpenMS and Qt.
+#
+# The package is collected straight from the file system: collect_all has to
+# import pyopenms (and therefore load libOpenMS and Qt) to enumerate its
+# submodules, which is slow and fragile during analysis. collect_all is only
+# used as a fallback when the walk finds neither binaries nor extension modules.
 
-from PyInstaller.utils.hooks import collect_all
+import ast
+import hashlib
+import importlib.machinery
+import importlib.metadata
+import logging
+import os
+import pickle
+import re
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
-datas, binaries, hiddenimports = collect_all('pyopenms')
+from PyInstaller.utils.hooks import collect_all, copy_metadata, get_package_paths
 
+logger = logging.getLogger("hook-pyopenms")
+
+# Lower-cased suffixes (after the last '.'); anything else is a data file.
+# Only the native library formats of the build platform are binaries: elsewhere,
+# e.g. the managed .NET .dll files under share/OpenMS/openms_thermo_bridge are
+# plain data and must not go through PyInstaller's binary dependency analysis.
+if sys.platform == "win32":
+    _EXT_MODULE_EXTS = frozenset({"pyd"})  # binaries that may be importable submodules
+    _LIB_EXTS = frozenset({"dll"})
+elif sys.platform == "darwin":
+    _EXT_MODULE_EXTS = frozenset({"so"})
+    _LIB_EXTS = frozenset({"dylib"})
+else:
+    _EXT_MODULE_EXTS = frozenset({"so"})
+    _LIB_EXTS = frozenset()
+_PY_EXTS = frozenset({"py", "pyc"})
+# Extension modules are recognised by their full suffix (.abi3.so,
+# .cpython-311-x86_64-linux-gnu.so, .pyd, ...), longest first so the whole
+# suffix is stripped from the module name. A bare ".so" is also how plain shared
+# libraries (libOpenMS.so) are named, so those files are libraries only.
+_EXT_MODULE_SUFFIXES = tuple(
+    sorted({s.lower() for s in importlib.machinery.EXTENSION_SUFFIXES if s != ".so"}, key=len, reverse=True)
+)
+# Versioned shared libraries (libOpenMS.so.3, libfoo.so.1.2) end in a number
+# rather than "so"; they are binaries but never importable modules.
+_VERSIONED_SO_PATTERN = re.compile(r"\.so(?:\.\d+)+$") if sys.platform != "win32" else None
+
+# Directory names that are never descended into
+_PRUNE = frozenset({"__pycache__", "__pyinstaller", "tests", "test"})
+
+# Bulky subtrees the viewer does not need at runtime (Qt translations, docs,
+# examples); only skipped when PYOPENMS_HOOK_MINIMAL=1 is set for the build.
+_MINIMAL = bool(os.environ.get("PYOPENMS_HOOK_MINIMAL"))
+if _MINIMAL:
+    _PRUNE = _PRUNE | frozenset({"translations", "doc", "docs", "examples"})
+
+
+def _scan(
+    root,
+    dest_root,
+    mod_root,
+    skip=frozenset(),
+    _ext_module_exts=_EXT_MODULE_EXTS,
+    _lib_exts=_LIB_EXTS,
+    _ext_module_suffixes=_EXT_MODULE_SUFFIXES,
+    _py_exts=_PY_EXTS,
+    _versioned_so=_VERSIONED_SO_PATTERN,
+):
+    """Walk ``root`` once and return ``(datas, binaries, hiddenimports, extension_modules)``.
+
+    Directories whose path is in ``skip`` are not descended into. Only
+    directories with an ``__init__.py`` (below a package, with identifier
+    names) are packages and yield hidden imports; ``.py`` files anywhere else
+    are collected as data files. Extension modules inside packages are
+    returned as module names only (PyInstaller collects them through the
+    import graph, like ``collect_all`` does); outside packages they are
+    plain binaries.
+    """
+    datas = []
+    binaries = []
+    hiddenimports = []
+    extension_modules = []
+
+    # Manual stack of (directory, destination, module prefix); destination and
+    # module prefix are computed once per directory instead of once per file.
+    # The module prefix is None below a directory that is not a package.
+    stack = [(root, dest_root, mod_root)]
+    while stack:
+        path, dest_dir, mod_prefix = stack.pop()
+        # Per-directory lists, flushed once the directory is known to be a package or not
+        dir_bins = []
+        dir_datas = []
+        dir_py = []
+        dir_ext_modules = []
+        subdirs = []
+        bins_append = dir_bins.append
+        datas_append = dir_datas.append
+        with os.scandir(path) as it:
+            for entry in it:
+                name = entry.name
+                if entry.is_dir():
+                    if name in _PRUNE or name.endswith(".dist-info") or entry.path in skip:
+                        continue
+                    subdirs.append(name)
+                    continue
+                # One suffix computation per file; no dot yields the whole name, which matches nothing
+                ext = name[name.rfind(".") + 1 :].lower()
+                if ext in _ext_module_exts or ext in _lib_exts:
+                    # Python extension modules (e.g. _pyopenms.abi3.so) are importable submodules
+                    lower = name.lower()
+                    for suffix in _ext_module_suffixes:
+                        if lower.endswith(suffix):
+                            stem = name[: -len(suffix)]
+                            if stem.isidentifier():
+                                dir_ext_modules.append((entry.path, stem))
+                                break
+                    else:
+                        bins_append(entry.path)
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("hook-pyopenms: found binary %s", entry.path)
+                elif ext in _py_exts:
+                    if ext == "py":
+                        dir_py.append(entry)
+                elif _versioned_so is not None and ext.isdigit() and _versioned_so.search(name):
+                    bins_append(entry.path)
+                else:
+                    datas_append(entry.path)
+
+        is_package = mod_prefix is not None and any(entry.name == "__init__.py" for entry in dir_py)
+        if is_package:
+            extension_modules.extend(mod_prefix + "." + stem for _src, stem in dir_ext_modules)
+            for entry in dir_py:
+                stem = entry.name[:-3]
+                if stem == "__init__":
+                    hiddenimports.append(mod_prefix)
+                elif stem.isidentifier():
+                    hiddenimports.append(mod_prefix + "." + stem)
+                else:
+                    datas_append(entry.path)
+        else:
+            dir_datas.extend(entry.path for entry in dir_py)
+            dir_bins.extend(src for src, _stem in dir_ext_modules)
+        binaries.extend((src, dest_dir) for src in dir_bins)
+        datas.extend((src, dest_dir) for src in dir_datas)
+
+        for name in subdirs:
+            sub_prefix = mod_prefix + "." + name if is_package and name.isidentifier() else None
+            stack.append((os.path.join(path, name), dest_dir + "/" + name, sub_prefix))
+
+    return datas, binaries, hiddenimports, extension_modules
+
+
+def collect_pyopenms_files(pkg_dir, package="pyopenms"):
+    """Walk ``pkg_dir`` and return ``(datas, binaries, hiddenimports, extension_modules)``.
+
+    The bundled ``share`` tree (OpenMS data files) holds most of the entries
+    and is walked on a second thread alongside the rest of the package.
+    """
+    share_dir = os.path.join(pkg_dir, "share")
+    if not os.path.isdir(share_dir):
+        return _scan(pkg_dir, package, package)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pkg_future = executor.submit(_scan, pkg_dir, package, package, frozenset({share_dir}))
+        share_future = executor.submit(_scan, share_dir, package + "/share", package + ".share")
+        datas, binaries, hiddenimports, extension_modules = pkg_future.result()
+        share_datas, share_binaries, share_hiddenimports, share_extension_modules = share_future.result()
+
+    return (
+        datas + share_datas,
+        binaries + share_binaries,
+        hiddenimports + share_hiddenimports,
+        extension_modules + share_extension_modules,
+    )
+
+
+def _discover_init_imports(init_file, package="pyopenms"):
+    """Return the ``package`` modules imported by ``init_file``, found by parsing it once."""
+    with open(init_file, "rb") as fh:
+        tree = ast.parse(fh.read(), init_file)
+
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                # Relative import inside the package __init__ resolves against the package itself
+                if node.module:
+                    names.add(f"{package}.{node.module}")
+                else:
+                    names.update(f"{package}.{alias.name}" for alias in node.names)
+            elif node.module:
+                names.add(node.module)
+    return tuple(sorted(n for n in names if n == package or n.startswith(package + ".")))
+
+
+def _cache_path(package, pkg_dir, use_collect_all):
+    """Cache file for the collected lists.
+
+    Keyed by the installed files (the dist-info RECORD, which lists every file
+    with its hash) and by this hook's own source, so both a reinstall and a
+    change to the collection rules invalidate the cache. Without a RECORD the
+    package directory mtime is used instead.
+    """
+    try:
+        dist = importlib.metadata.distribution(package)
+        version = dist.version
+        record = dist.read_text("RECORD")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+        record = None
+    if not record:
+        record = str(os.path.getmtime(pkg_dir))
+    with open(__file__, "rb") as fh:
+        hook_source = fh.read()
+    raw = f"{pkg_dir}|{version}|{sys.platform}|{use_collect_all}|{_MINIMAL}|{record}".encode()
+    key = hashlib.blake2b(raw + hook_source).hexdigest()[:16]
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "pyinstaller-hooks", f"{package}-{version}-{key}.pkl")
+
+
+def _collect(package, pkg_dir, use_collect_all):
+    if use_collect_all:
+        return collect_all(package)
+
+    datas, binaries, hiddenimports, extension_modules = collect_pyopenms_files(pkg_dir, package)
+    if not binaries and not extension_modules:
+        # Unexpected layout (e.g. zipped or namespace install): let PyInstaller introspect it
+        return collect_all(package)
+    hiddenimports = extension_modules + hiddenimports
+    init_file = os.path.join(pkg_dir, "__init__.py")
+    if os.path.isfile(init_file):
+        known = set(hiddenimports)
+        hiddenimports += [n for n in _discover_init_imports(init_file, package) if n not in known]
+    # pyopenms reads its own version via importlib.metadata
+    datas += copy_metadata(package)
+    return datas, binaries, hiddenimports
+
+
+def gather(package="pyopenms", use_collect_all=False):
+    """Return ``(datas, binaries, hiddenimports)`` for ``package``.
+
+    The package directory is walked without importing it unless
+    ``use_collect_all`` is set. Results are cached on disk across builds;
+    set ``PYOPENMS_HOOK_NO_CACHE=1`` to bypass the cache.
+    """
+    _pkg_base, pkg_dir = get_package_paths(package)
+
+    if os.environ.get("PYOPENMS_HOOK_NO_CACHE"):
+        return _collect(package, pkg_dir, use_collect_all)
+
+    cache_path = _cache_path(package, pkg_dir, use_collect_all)
+    try:
+        with open(cache_path, "rb") as fh:
+            return pickle.load(fh)
+    except Exception:
+        # Missing, truncated or otherwise unreadable cache: rebuild it
+        pass
+
+    result = _collect(package, pkg_dir, use_collect_all)
+    cache_dir = os.path.dirname(cache_path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file and rename it into place so concurrent
+        # builds never read a partially written cache
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                pickle.dump(result, fh)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+    return result
+
+
+datas, binaries, hiddenimports = gather()
+logger.info(
+    "hook-pyopenms: collected %d data files, %d binaries, %d hidden imports",
+    len(datas),
+    len(binaries),
+    len(hiddenimports),
+)
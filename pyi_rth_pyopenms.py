@@ -0,0 +1,36 @@
+# PyInstaller runtime hook for pyopenms
+# Register the bundle's DLL directories before pyopenms is imported so that
+# libOpenMS and its dependencies resolve from inside the frozen app on Windows.
+#
+# The bundle layout is fixed at build time by hook-pyopenms.py, so the
+# directories are registered unconditionally instead of probing them first.
+
+import os
+import sys
+
+# Bundle-relative directories that may hold DLLs, in search order. Stored as
+# ready-made Windows path suffixes and appended to sys._MEIPASS (an absolute,
+# normalized path) directly instead of going through os.path.join.
+_DLL_SUBDIRS = (
+    "",
+    "\\pyopenms",
+    "\\pyopenms\\Qt6\\bin",
+    "\\pyopenms\\Qt6\\plugins\\platforms",
+    "\\pyopenms\\share",
+)
+
+# Handles returned by os.add_dll_directory(); kept referenced for the lifetime
+# of the process so the directories stay registered.
+_dll_directory_handles = []
+
+# Windows only: elsewhere the dynamic loader resolves the bundled libraries
+# via rpath and there is nothing to do (os.add_dll_directory exists on
+# Windows from Python 3.8 onwards).
+if sys.platform == "win32":
+    _add_dll_directory = os.add_dll_directory
+    _base = sys._MEIPASS
+    for _suffix in _DLL_SUBDIRS:
+        try:
+            _dll_directory_handles.append(_add_dll_directory(_base + _suffix))
+        except OSError:
+            pass
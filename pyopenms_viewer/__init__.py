@@ -4,10 +4,30 @@ pyopenms-viewer: Fast mzML peak map viewer using NiceGUI, Datashader, and pyOpen
 Designed to handle 50+ million peaks with smooth zooming and panning.
 """
 
+import importlib
+
 __version__ = "0.2.0"
 
-from pyopenms_viewer.cli import main
-from pyopenms_viewer.core.events import EventBus
-from pyopenms_viewer.core.state import ViewerState
+# Public names resolved on first access (PEP 562), so that importing the
+# package (e.g. to read __version__) does not load the CLI and state modules.
+_LAZY = {
+    "main": ("pyopenms_viewer.cli", "main"),
+    "EventBus": ("pyopenms_viewer.core.events", "EventBus"),
+    "ViewerState": ("pyopenms_viewer.core.state", "ViewerState"),
+}
 
 __all__ = ["ViewerState", "EventBus", "main", "__version__"]
+
+
+def __getattr__(name):
+    try:
+        module_name, attr = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -5,19 +5,21 @@ Usage:
 """
 
 import sys
-from multiprocessing import freeze_support
-
-from pyopenms_viewer.cli import (
-    _run_embedded_python_snippet,
-    _sanitize_pyinstaller_args,
-    main,
-)
-
 
 if __name__ == "__main__":
-    freeze_support()
+    # Imports are deferred so that helper re-executions (``-c`` snippets) do
+    # not pay for multiprocessing before it is known to be needed.
+    from pyopenms_viewer.cli import _run_embedded_python_snippet, _sanitize_pyinstaller_args
+
     argv = _sanitize_pyinstaller_args(sys.argv)
     if _run_embedded_python_snippet(argv):
         sys.exit(0)
+
+    from multiprocessing import freeze_support
+
+    freeze_support()
+
+    from pyopenms_viewer.cli import main
+
     sys.argv[:] = argv
     main()
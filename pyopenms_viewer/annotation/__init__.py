@@ -1,18 +1,21 @@
 """Annotation modules for spectrum matching and labeling."""
 
-from pyopenms_viewer.annotation.spectrum_annotator import (
-    annotate_spectrum_with_id,
-    get_external_peak_annotations,
-    parse_fragment_annotation_string,
-)
-from pyopenms_viewer.annotation.theoretical_spectrum import generate_theoretical_spectrum
-from pyopenms_viewer.annotation.tick_formatter import (
-    calculate_nice_ticks,
-    format_intensity,
-    format_mz_label,
-    format_rt_label,
-    format_tick_label,
-)
+import importlib
+
+# Names are resolved from their submodule on first access (PEP 562), so that
+# importing tick_formatter (e.g. from the renderers) does not load pyopenms
+# through spectrum_annotator and theoretical_spectrum.
+_LAZY = {
+    "calculate_nice_ticks": "pyopenms_viewer.annotation.tick_formatter",
+    "format_tick_label": "pyopenms_viewer.annotation.tick_formatter",
+    "format_rt_label": "pyopenms_viewer.annotation.tick_formatter",
+    "format_mz_label": "pyopenms_viewer.annotation.tick_formatter",
+    "format_intensity": "pyopenms_viewer.annotation.tick_formatter",
+    "generate_theoretical_spectrum": "pyopenms_viewer.annotation.theoretical_spectrum",
+    "annotate_spectrum_with_id": "pyopenms_viewer.annotation.spectrum_annotator",
+    "get_external_peak_annotations": "pyopenms_viewer.annotation.spectrum_annotator",
+    "parse_fragment_annotation_string": "pyopenms_viewer.annotation.spectrum_annotator",
+}
 
 __all__ = [
     "calculate_nice_ticks",
@@ -25,3 +28,17 @@ __all__ = [
     "get_external_peak_annotations",
     "parse_fragment_annotation_string",
 ]
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
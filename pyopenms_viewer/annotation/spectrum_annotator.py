@@ -1,5 +1,6 @@
 """Spectrum annotation using theoretical spectra matching."""
 
+import functools
 import re
 from dataclasses import dataclass, field
 from typing import Optional
@@ -11,11 +12,29 @@ from pyopenms import (
     MSSpectrum,
     SpectrumAlignment,
     SpectrumAnnotator,
-    TheoreticalSpectrumGenerator,
 )
 
-from pyopenms_viewer.annotation.theoretical_spectrum import generate_theoretical_spectrum
-from pyopenms_viewer.core.config import ION_COLORS
+from pyopenms_viewer.annotation.theoretical_spectrum import (
+    generate_theoretical_spectrum,
+    get_theoretical_spectrum_generator,
+)
+from pyopenms_viewer.core.config import DEFAULTS, ION_COLORS
+from pyopenms_viewer.utils.plot_utils import stem_arrays
+
+# Precompiled patterns for fragment annotation strings and ion label formatting
+# One "ion@mz" token of a comma/whitespace separated fragment annotation string
+_ANNOTATION_TOKEN_PATTERN = re.compile(
+    r"(?:^|(?<=[,\s]))([^,\s@]*)@([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)(?=[,\s]|$)"
+)
+_TRAILING_CHARGE_PATTERN = re.compile(r"(\++|\-+|\+\d+|\-\d+)$")
+_ION_BASE_PATTERN = re.compile(r"^([abcxyzABCXYZ])(\d+)(.*)$")
+_PLUS_RUN_PATTERN = re.compile(r"\++$")
+_MINUS_RUN_PATTERN = re.compile(r"-+$")
+_PLUS_NUM_PATTERN = re.compile(r"\+(\d+)$")
+_MINUS_NUM_PATTERN = re.compile(r"-(\d+)$")
+
+# Fragment ion series keyed by the first character of an ion name (either case)
+_ION_TYPE_BY_FIRST_CHAR = {c: c for c in "abcxyz"} | {c.upper(): c for c in "abcxyz"}
 
 
 @dataclass
@@ -31,6 +50,63 @@ class MatchedIon:
     ion_name: str  # Ion name (e.g., "b3", "y5+2")
     ion_type: str  # Ion type (e.g., "b", "y", "a")
     mz_error: float  # m/z error (exp - theo)
+    formatted_name: str = ""  # HTML label for plots; derived from ion_name if empty
+
+    def __post_init__(self):
+        if not self.formatted_name:
+            self.formatted_name = format_ion_label_with_superscript(self.ion_name)
+
+
+@dataclass
+class MatchedIonArrays:
+    """Matched ions as parallel NumPy columns (structure of arrays) for vectorized drawing."""
+
+    exp_mz: np.ndarray  # float64
+    exp_intensity_pct: np.ndarray  # float64
+    exp_peak_idx: np.ndarray  # int64
+    theo_mz: np.ndarray  # float64
+    theo_intensity: np.ndarray  # float64
+    mz_error: np.ndarray  # float64
+    ion_name: np.ndarray  # object (str)
+    ion_type: np.ndarray  # object (str)
+    formatted_name: np.ndarray  # object (str)
+
+    @classmethod
+    def from_ions(cls, ions: list[MatchedIon]) -> "MatchedIonArrays":
+        """Build the columns from a list of MatchedIon in one pass per column."""
+        n = len(ions)
+
+        def column(attr: str, dtype) -> np.ndarray:
+            return np.fromiter((getattr(ion, attr) for ion in ions), dtype=dtype, count=n)
+
+        return cls(
+            exp_mz=column("exp_mz", np.float64),
+            exp_intensity_pct=column("exp_intensity_pct", np.float64),
+            exp_peak_idx=column("exp_peak_idx", np.int64),
+            theo_mz=column("theo_mz", np.float64),
+            theo_intensity=column("theo_intensity", np.float64),
+            mz_error=column("mz_error", np.float64),
+            ion_name=np.array([ion.ion_name for ion in ions], dtype=object),
+            ion_type=np.array([ion.ion_type for ion in ions], dtype=object),
+            formatted_name=np.array([ion.formatted_name for ion in ions], dtype=object),
+        )
+
+    def __len__(self) -> int:
+        return len(self.exp_mz)
+
+    def select(self, mask: np.ndarray) -> "MatchedIonArrays":
+        """Return the subset of ions selected by a boolean mask or index array."""
+        return MatchedIonArrays(
+            exp_mz=self.exp_mz[mask],
+            exp_intensity_pct=self.exp_intensity_pct[mask],
+            exp_peak_idx=self.exp_peak_idx[mask],
+            theo_mz=self.theo_mz[mask],
+            theo_intensity=self.theo_intensity[mask],
+            mz_error=self.mz_error[mask],
+            ion_name=self.ion_name[mask],
+            ion_type=self.ion_type[mask],
+            formatted_name=self.formatted_name[mask],
+        )
 
 
 @dataclass
@@ -41,6 +117,11 @@ class UnmatchedIon:
     theo_intensity: float  # Theoretical intensity (predicted)
     ion_name: str  # Ion name
     ion_type: str  # Ion type
+    formatted_name: str = ""  # HTML label for plots; derived from ion_name if empty
+
+    def __post_init__(self):
+        if not self.formatted_name:
+            self.formatted_name = format_ion_label_with_superscript(self.ion_name)
 
 
 @dataclass
@@ -60,16 +141,91 @@ class SpectrumAnnotationData:
     n_theoretical: int = 0
     n_matched: int = 0
     coverage: float = 0.0  # n_matched / n_theoretical
+    # Experimental intensities as % of the base peak, reused by the plot
+    exp_int_pct: Optional[np.ndarray] = field(default=None, repr=False)
 
     def get_matched_by_type(self, ion_type: str) -> list[MatchedIon]:
         """Get matched ions of a specific type."""
         return [ion for ion in self.matched_ions if ion.ion_type == ion_type]
 
+    def matched_arrays(self) -> MatchedIonArrays:
+        """Get the matched ions as columnar NumPy arrays."""
+        return MatchedIonArrays.from_ions(self.matched_ions)
+
     def get_unmatched_by_type(self, ion_type: str) -> list[UnmatchedIon]:
         """Get unmatched ions of a specific type."""
         return [ion for ion in self.unmatched_ions if ion.ion_type == ion_type]
 
 
+def _relative_intensity(exp_int: np.ndarray) -> np.ndarray:
+    """Scale intensities to % of the base peak as float32 in a single pass."""
+    max_int = exp_int.max() if len(exp_int) > 0 else 0.0
+    if max_int <= 0:
+        return np.asarray(exp_int, dtype=np.float32)
+    return np.multiply(exp_int, 100.0 / max_int, dtype=np.float32)
+
+
+def _match_closest_peaks(ref_mz: np.ndarray, query_mz: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Find the closest reference peak for every query m/z.
+
+    Sorts the reference peaks once and binary-searches all queries in one
+    call, then keeps the closer of the two neighbouring peaks (the left one
+    wins ties).
+
+    Args:
+        ref_mz: Reference m/z array to search (any order, non-empty)
+        query_mz: m/z values to look up
+
+    Returns:
+        Tuple of (peak_idx, errors): index of the closest peak in ``ref_mz``
+        and its m/z error (ref - query) for each query
+    """
+    n_peaks = len(ref_mz)
+    sort_idx = np.argsort(ref_mz, kind="stable")
+    ref_mz_sorted = ref_mz[sort_idx]
+    pos = np.searchsorted(ref_mz_sorted, query_mz)
+    left = np.clip(pos - 1, 0, n_peaks - 1)
+    right = np.clip(pos, 0, n_peaks - 1)
+    d_left = np.abs(query_mz - ref_mz_sorted[left])
+    d_right = np.abs(ref_mz_sorted[right] - query_mz)
+    peak_idx = sort_idx[np.where(d_left <= d_right, left, right)]
+    return peak_idx, ref_mz[peak_idx] - query_mz
+
+
+@dataclass(frozen=True)
+class _TheoreticalIonColumns:
+    """Theoretical ions of one peptide as parallel columns."""
+
+    mz: np.ndarray  # float64, read-only
+    intensity: np.ndarray  # float64, read-only
+    names: tuple[str, ...]
+    types: tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_theo_spec(sequence_str: str, charge: int) -> _TheoreticalIonColumns:
+    """Generate the theoretical spectrum for a peptide as ion columns.
+
+    Cached because the same identification is re-annotated on every redraw of
+    the spectrum view. The returned objects are shared between calls and must
+    not be modified. Sequence parse errors propagate and are not cached.
+    """
+    ions = generate_theoretical_spectrum(AASequence.fromString(sequence_str), charge).ions
+    mz = np.fromiter((ion.mz for ion in ions), dtype=np.float64, count=len(ions))
+    intensity = np.fromiter((ion.intensity for ion in ions), dtype=np.float64, count=len(ions))
+    mz.flags.writeable = False
+    intensity.flags.writeable = False
+    return _TheoreticalIonColumns(
+        mz=mz,
+        intensity=intensity,
+        names=tuple(ion.name for ion in ions),
+        types=tuple(ion.ion_type for ion in ions),
+    )
+
+
 def compute_spectrum_annotation(
     exp_mz: np.ndarray,
     exp_int: np.ndarray,
@@ -98,13 +254,11 @@ def compute_spectrum_annotation(
         SpectrumAnnotationData with matched and unmatched ions
     """
     # Normalize intensities
-    max_int = exp_int.max() if len(exp_int) > 0 else 1.0
-    exp_int_pct = (exp_int / max_int) * 100 if max_int > 0 else exp_int
+    exp_int_pct = _relative_intensity(exp_int)
 
     # Generate theoretical spectrum
     try:
-        seq = AASequence.fromString(sequence_str)
-        theo_spec = generate_theoretical_spectrum(seq, charge)
+        theo = _cached_theo_spec(sequence_str, charge)
     except Exception:
         # Return empty annotation data if sequence parsing fails
         return SpectrumAnnotationData(
@@ -112,89 +266,85 @@ def compute_spectrum_annotation(
             charge=charge,
             precursor_mz=precursor_mz,
             tolerance_da=tolerance_da,
+            exp_int_pct=exp_int_pct,
         )
 
     matched_ions: list[MatchedIon] = []
     unmatched_ions: list[UnmatchedIon] = []
-    matched_theo_mz: set[float] = set()  # Track which theoretical ions were matched
+    n_theoretical = len(theo)
+    matched_mask = np.zeros(n_theoretical, dtype=bool)  # Theoretical ions that were matched
 
     if external_annotations:
         # Use external annotations (from SpectrumAnnotator or idXML)
-        for peak_idx, ion_name, ion_type in external_annotations:
-            if peak_idx < len(exp_mz):
-                exp_mz_val = float(exp_mz[peak_idx])
-                exp_int_val = float(exp_int[peak_idx])
-                exp_int_pct_val = float(exp_int_pct[peak_idx])
-
-                # Find matching theoretical ion
+        external_annotations = [ann for ann in external_annotations if ann[0] < len(exp_mz)]
+        ext_peak_idx = np.fromiter((ann[0] for ann in external_annotations), dtype=np.int64)
+        ext_mz = exp_mz[ext_peak_idx]
+
+        # Closest theoretical ion for every annotated peak; peaks without one
+        # within tolerance keep their own m/z as the theoretical value
+        if n_theoretical > 0 and len(ext_mz) > 0:
+            theo_idx, theo_errors = _match_closest_peaks(theo.mz, ext_mz)
+            within_tol = np.abs(theo_errors) <= tolerance_da
+            matched_mask[theo_idx[within_tol]] = True
+        else:
+            theo_idx = np.zeros(len(ext_mz), dtype=np.int64)
+            within_tol = np.zeros(len(ext_mz), dtype=bool)
+
+        for (peak_idx, ion_name, ion_type), exp_mz_val, ti, has_theo in zip(
+            external_annotations, ext_mz.tolist(), theo_idx.tolist(), within_tol.tolist()
+        ):
+            if has_theo:
+                theo_mz_val = float(theo.mz[ti])
+                theo_int_val = float(theo.intensity[ti])
+            else:
                 theo_mz_val = exp_mz_val  # Default to exp m/z
                 theo_int_val = 1.0
-                mz_error = 0.0
-
-                for theo_ion in theo_spec.ions:
-                    if abs(theo_ion.mz - exp_mz_val) <= tolerance_da:
-                        theo_mz_val = theo_ion.mz
-                        theo_int_val = theo_ion.intensity
-                        mz_error = exp_mz_val - theo_ion.mz
-                        matched_theo_mz.add(theo_ion.mz)
-                        break
 
-                matched_ions.append(
-                    MatchedIon(
-                        exp_mz=exp_mz_val,
-                        exp_intensity=exp_int_val,
-                        exp_intensity_pct=exp_int_pct_val,
-                        exp_peak_idx=peak_idx,
-                        theo_mz=theo_mz_val,
-                        theo_intensity=theo_int_val,
-                        ion_name=ion_name,
-                        ion_type=ion_type,
-                        mz_error=mz_error,
-                    )
+            matched_ions.append(
+                MatchedIon(
+                    exp_mz=exp_mz_val,
+                    exp_intensity=float(exp_int[peak_idx]),
+                    exp_intensity_pct=float(exp_int_pct[peak_idx]),
+                    exp_peak_idx=peak_idx,
+                    theo_mz=theo_mz_val,
+                    theo_intensity=theo_int_val,
+                    ion_name=ion_name,
+                    ion_type=ion_type,
+                    mz_error=exp_mz_val - theo_mz_val,
                 )
+            )
     else:
         # Match theoretical ions to experimental peaks
-        for theo_ion in theo_spec.ions:
-            if len(exp_mz) == 0:
-                continue
-
-            # Find closest experimental peak
-            diffs = np.abs(exp_mz - theo_ion.mz)
-            min_idx = int(np.argmin(diffs))
-
-            if diffs[min_idx] <= tolerance_da:
-                matched_theo_mz.add(theo_ion.mz)
+        if len(exp_mz) > 0 and n_theoretical > 0:
+            peak_idx, errors = _match_closest_peaks(exp_mz, theo.mz)
+            matched_mask = np.abs(errors) <= tolerance_da
+            for ti in np.flatnonzero(matched_mask).tolist():
+                min_idx = int(peak_idx[ti])
                 matched_ions.append(
                     MatchedIon(
                         exp_mz=float(exp_mz[min_idx]),
                         exp_intensity=float(exp_int[min_idx]),
                         exp_intensity_pct=float(exp_int_pct[min_idx]),
                         exp_peak_idx=min_idx,
-                        theo_mz=theo_ion.mz,
-                        theo_intensity=theo_ion.intensity,
-                        ion_name=theo_ion.name,
-                        ion_type=theo_ion.ion_type,
-                        mz_error=float(exp_mz[min_idx]) - theo_ion.mz,
+                        theo_mz=float(theo.mz[ti]),
+                        theo_intensity=float(theo.intensity[ti]),
+                        ion_name=theo.names[ti],
+                        ion_type=theo.types[ti],
+                        mz_error=float(errors[ti]),
                     )
                 )
 
     # Find unmatched theoretical ions
-    for theo_ion in theo_spec.ions:
-        is_matched = any(
-            abs(theo_ion.mz - m) <= tolerance_da * 0.1  # Tighter tolerance for set membership
-            for m in matched_theo_mz
-        )
-        if not is_matched:
-            unmatched_ions.append(
-                UnmatchedIon(
-                    theo_mz=theo_ion.mz,
-                    theo_intensity=theo_ion.intensity,
-                    ion_name=theo_ion.name,
-                    ion_type=theo_ion.ion_type,
-                )
+    for ti in np.flatnonzero(~matched_mask).tolist():
+        unmatched_ions.append(
+            UnmatchedIon(
+                theo_mz=float(theo.mz[ti]),
+                theo_intensity=float(theo.intensity[ti]),
+                ion_name=theo.names[ti],
+                ion_type=theo.types[ti],
             )
+        )
 
-    n_theoretical = len(theo_spec.ions)
     n_matched = len(matched_ions)
     coverage = n_matched / n_theoretical if n_theoretical > 0 else 0.0
 
@@ -208,9 +358,27 @@ def compute_spectrum_annotation(
         n_theoretical=n_theoretical,
         n_matched=n_matched,
         coverage=coverage,
+        exp_int_pct=exp_int_pct,
     )
 
 
+@functools.lru_cache(maxsize=16)
+def _get_spectrum_alignment(tolerance_da: float) -> SpectrumAlignment:
+    """Get a shared SpectrumAlignment with an absolute tolerance in Da."""
+    sa = SpectrumAlignment()
+    sa_params = sa.getParameters()
+    sa_params.setValue("tolerance", tolerance_da)
+    sa_params.setValue("is_relative_tolerance", "false")
+    sa.setParameters(sa_params)
+    return sa
+
+
+@functools.lru_cache(maxsize=1)
+def _get_spectrum_annotator() -> SpectrumAnnotator:
+    """Get the shared (stateless) SpectrumAnnotator."""
+    return SpectrumAnnotator()
+
+
 def annotate_spectrum_with_id(
     spectrum: MSSpectrum,
     peptide_hit,
@@ -232,30 +400,17 @@ def annotate_spectrum_with_id(
     annotations = []
 
     try:
+        # Nothing can match without peaks or a sequence; skip the annotation pipeline
+        if spectrum.size() == 0 or peptide_hit is None or peptide_hit.getSequence().empty():
+            return annotations
+
         # Create copy to avoid modifying original
         spec_copy = MSSpectrum(spectrum)
 
-        # Setup TheoreticalSpectrumGenerator
-        tsg = TheoreticalSpectrumGenerator()
-        params = tsg.getParameters()
-        params.setValue("add_b_ions", "true")
-        params.setValue("add_y_ions", "true")
-        params.setValue("add_a_ions", "true")
-        params.setValue("add_c_ions", "false")
-        params.setValue("add_x_ions", "false")
-        params.setValue("add_z_ions", "false")
-        params.setValue("add_metainfo", "true")
-        tsg.setParameters(params)
-
-        # Setup SpectrumAlignment with absolute tolerance in Da
-        sa = SpectrumAlignment()
-        sa_params = sa.getParameters()
-        sa_params.setValue("tolerance", tolerance_da)
-        sa_params.setValue("is_relative_tolerance", "false")
-        sa.setParameters(sa_params)
-
-        # Setup SpectrumAnnotator
-        annotator = SpectrumAnnotator()
+        # Shared, preconfigured generator, alignment and annotator
+        tsg = get_theoretical_spectrum_generator()
+        sa = _get_spectrum_alignment(tolerance_da)
+        annotator = _get_spectrum_annotator()
 
         # Annotate the spectrum - this adds "IonNames" string data array
         annotator.annotateMatches(spec_copy, peptide_hit, tsg, sa)
@@ -266,28 +421,15 @@ def annotate_spectrum_with_id(
             arr_name = arr.getName()
             # Handle both bytes and string for array name
             if arr_name == "IonNames" or arr_name == b"IonNames":
-                for peak_idx, ion_name in enumerate(arr):
-                    if ion_name:
-                        # Handle bytes or string annotation
-                        if isinstance(ion_name, bytes):
-                            ion_name = ion_name.decode("utf-8", errors="ignore")
-
-                        # Determine ion type from name
-                        if ion_name.startswith("b"):
-                            ion_type = "b"
-                        elif ion_name.startswith("y"):
-                            ion_type = "y"
-                        elif ion_name.startswith("a"):
-                            ion_type = "a"
-                        elif ion_name.startswith("c"):
-                            ion_type = "c"
-                        elif ion_name.startswith("x"):
-                            ion_type = "x"
-                        elif ion_name.startswith("z"):
-                            ion_type = "z"
-                        else:
-                            ion_type = "unknown"
-                        annotations.append((peak_idx, ion_name, ion_type))
+                # Fetch all names in one call, handling bytes or string annotations
+                ion_names = [
+                    name.decode("utf-8", errors="ignore") if type(name) is bytes else name for name in arr.get_data()
+                ]
+                annotations = [
+                    (peak_idx, ion_name, _get_ion_type(ion_name))
+                    for peak_idx, ion_name in enumerate(ion_names)
+                    if ion_name
+                ]
                 break
 
     except Exception as e:
@@ -361,30 +503,27 @@ def parse_fragment_annotation_string(
     if not annotation_str:
         return annotations
 
-    # Split by common separators
-    parts = re.split(r"[,\s]+", annotation_str.strip())
+    # Extract all "ion@mz" tokens in one pass; tokens without a numeric m/z are skipped
+    tokens = _ANNOTATION_TOKEN_PATTERN.findall(annotation_str)
+    if not tokens:
+        return annotations
 
     mz_array, _ = spectrum.get_peaks()
+    if len(mz_array) == 0:
+        return annotations
 
-    for part in parts:
-        if "@" in part:
-            ion_part, mz_part = part.split("@", 1)
-            try:
-                target_mz = float(mz_part)
-                # Find closest peak
-                if len(mz_array) > 0:
-                    diffs = abs(mz_array - target_mz)
-                    min_idx = int(diffs.argmin())
-                    if diffs[min_idx] < 0.5:  # Within 0.5 Da
-                        ion_name = ion_part
-                        ion_type = _get_ion_type(ion_name)
-                        annotations.append((min_idx, ion_name, ion_type))
-            except ValueError:
-                pass
+    # Find closest peak for all tokens at once
+    target_mz = np.array([float(mz_part) for _, mz_part in tokens])
+    peak_idx, errors = _match_closest_peaks(mz_array, target_mz)
+
+    for (ion_name, _), min_idx, within_tol in zip(tokens, peak_idx.tolist(), (np.abs(errors) < 0.5).tolist()):
+        if within_tol:  # Within 0.5 Da
+            annotations.append((min_idx, ion_name, _get_ion_type(ion_name)))
 
     return annotations
 
 
+@functools.lru_cache(maxsize=2048)
 def format_ion_label_with_superscript(ion_name: str) -> str:
     """Format ion name with index as subscript and charge as superscript.
 
@@ -413,13 +552,13 @@ def format_ion_label_with_superscript(ion_name: str) -> str:
     base_name = ion_name
 
     # Check for trailing charge patterns (must be at the very end)
-    charge_match = re.search(r"(\++|\-+|\+\d+|\-\d+)$", ion_name)
+    charge_match = _TRAILING_CHARGE_PATTERN.search(ion_name)
     if charge_match:
         trailing_charge = charge_match.group(1)
         base_name = ion_name[: charge_match.start()]
 
     # Now parse the base name for a,b,c,x,y,z ion pattern: letter + digits + optional modifier
-    match = re.match(r"^([abcxyzABCXYZ])(\d+)(.*)$", base_name)
+    match = _ION_BASE_PATTERN.match(base_name)
     if match:
         ion_type = match.group(1)
         index = match.group(2)
@@ -457,25 +596,25 @@ def _parse_charge_string(charge_part: str) -> str:
         return ""
 
     # Pattern 1: Repeated + (e.g., "+", "++", "+++")
-    match_repeated_plus = re.match(r"^\++$", charge_part)
+    match_repeated_plus = _PLUS_RUN_PATTERN.match(charge_part)
     if match_repeated_plus:
         charge_count = len(charge_part)
         return "+" if charge_count == 1 else f"{charge_count}+"
 
     # Pattern 2: Repeated - (e.g., "-", "--", "---")
-    match_repeated_minus = re.match(r"^-+$", charge_part)
+    match_repeated_minus = _MINUS_RUN_PATTERN.match(charge_part)
     if match_repeated_minus:
         charge_count = len(charge_part)
         return "-" if charge_count == 1 else f"{charge_count}-"
 
     # Pattern 3: +N (e.g., "+2", "+3")
-    match_plus_num = re.match(r"^\+(\d+)$", charge_part)
+    match_plus_num = _PLUS_NUM_PATTERN.match(charge_part)
     if match_plus_num:
         charge_num = int(match_plus_num.group(1))
         return "+" if charge_num == 1 else f"{charge_num}+"
 
     # Pattern 4: -N (e.g., "-2", "-3")
-    match_minus_num = re.match(r"^-(\d+)$", charge_part)
+    match_minus_num = _MINUS_NUM_PATTERN.match(charge_part)
     if match_minus_num:
         charge_num = int(match_minus_num.group(1))
         return "-" if charge_num == 1 else f"{charge_num}-"
@@ -494,14 +633,14 @@ def _format_charge_only(ion_name: str) -> str:
         Ion name with charge formatted as superscript HTML
     """
     # Pattern 1: Repeated + or - at the end (e.g., "precursor++")
-    match_repeated_plus = re.search(r"\++$", ion_name)
+    match_repeated_plus = _PLUS_RUN_PATTERN.search(ion_name)
     if match_repeated_plus:
         charge_count = len(match_repeated_plus.group())
         base_name = ion_name[: match_repeated_plus.start()]
         charge_str = "+" if charge_count == 1 else f"{charge_count}+"
         return f"{base_name}<sup>{charge_str}</sup>"
 
-    match_repeated_minus = re.search(r"-+$", ion_name)
+    match_repeated_minus = _MINUS_RUN_PATTERN.search(ion_name)
     if match_repeated_minus:
         charge_count = len(match_repeated_minus.group())
         base_name = ion_name[: match_repeated_minus.start()]
@@ -509,14 +648,14 @@ def _format_charge_only(ion_name: str) -> str:
         return f"{base_name}<sup>{charge_str}</sup>"
 
     # Pattern 2: Number after + or - (e.g., "precursor+2")
-    match_plus_num = re.search(r"\+(\d+)$", ion_name)
+    match_plus_num = _PLUS_NUM_PATTERN.search(ion_name)
     if match_plus_num:
         charge_num = int(match_plus_num.group(1))
         base_name = ion_name[: match_plus_num.start()]
         charge_str = "+" if charge_num == 1 else f"{charge_num}+"
         return f"{base_name}<sup>{charge_str}</sup>"
 
-    match_minus_num = re.search(r"-(\d+)$", ion_name)
+    match_minus_num = _MINUS_NUM_PATTERN.search(ion_name)
     if match_minus_num:
         charge_num = int(match_minus_num.group(1))
         base_name = ion_name[: match_minus_num.start()]
@@ -536,25 +675,17 @@ def _get_ion_type(ion_name: str) -> str:
     Returns:
         Ion type character ("b", "y", "a", "c", "x", "z", "precursor", "unknown")
     """
+    if not ion_name:
+        return "unknown"
+    ion_type = _ION_TYPE_BY_FIRST_CHAR.get(ion_name[0])
+    if ion_type is not None:
+        return ion_type
+
+    # Rare names that do not start with a fragment ion letter
     name = ion_name.lower()
-    if name.startswith("b"):
-        return "b"
-    elif name.startswith("y"):
-        return "y"
-    elif name.startswith("a"):
-        return "a"
-    elif name.startswith("c"):
-        return "c"
-    elif name.startswith("x"):
-        return "x"
-    elif name.startswith("z"):
-        return "z"
-    elif "precursor" in name or "prec" in name or "[m" in name:
+    if "prec" in name or "[m" in name:
         return "precursor"
-    elif "mi:" in name or name.startswith("i"):
-        return "unknown"  # Immonium ions
-    else:
-        return "unknown"
+    return "unknown"  # Immonium ("i", "MI:") and other ions
 
 
 def get_external_peak_annotations_from_hit(
@@ -586,20 +717,22 @@ def get_external_peak_annotations_from_hit(
         if not peak_annotations:
             return annotations
 
-        for peak_ann in peak_annotations:
-            ann_mz = peak_ann.mz
+        # Find closest experimental peak for all annotations at once
+        ann_mz = np.fromiter((peak_ann.mz for peak_ann in peak_annotations), dtype=np.float64)
+        peak_idx, errors = _match_closest_peaks(exp_mz, ann_mz)
+        within_tol = (np.abs(errors) <= tolerance_da).tolist()
+
+        for peak_ann, min_idx, matched in zip(peak_annotations, peak_idx.tolist(), within_tol):
+            if not matched:
+                continue
             ion_name = peak_ann.annotation
 
             # Handle bytes if needed
             if isinstance(ion_name, bytes):
                 ion_name = ion_name.decode("utf-8", errors="ignore")
 
-            # Find closest experimental peak within tolerance
-            diffs = np.abs(exp_mz - ann_mz)
-            min_idx = np.argmin(diffs)
-            if diffs[min_idx] <= tolerance_da:
-                ion_type = _get_ion_type(ion_name)
-                annotations.append((int(min_idx), ion_name, ion_type))
+            ion_type = _get_ion_type(ion_name)
+            annotations.append((min_idx, ion_name, ion_type))
 
     except Exception as e:
         print(f"Error getting external peak annotations: {e}")
@@ -634,22 +767,25 @@ def create_annotated_spectrum_plot(
     Returns:
         Plotly Figure object with annotated spectrum
     """
-    # Normalize intensities to percentage
-    max_int = exp_int.max() if len(exp_int) > 0 else 1
-    exp_int_norm = (exp_int / max_int) * 100
+    # Normalize intensities to percentage, reusing the annotation's copy when available
+    if (
+        annotation_data is not None
+        and annotation_data.exp_int_pct is not None
+        and len(annotation_data.exp_int_pct) == len(exp_int)
+    ):
+        exp_int_norm = annotation_data.exp_int_pct
+    else:
+        exp_int_norm = _relative_intensity(exp_int)
 
     # Create figure
     fig = go.Figure()
+    trace_cls = go.Scattergl if len(exp_mz) > DEFAULTS.WEBGL_POINT_THRESHOLD else go.Scatter
 
     # Add experimental spectrum as vertical lines (stem plot)
-    x_stems = []
-    y_stems = []
-    for mz, intensity in zip(exp_mz, exp_int_norm):
-        x_stems.extend([mz, mz, None])
-        y_stems.extend([0, intensity, None])
+    x_stems, y_stems = stem_arrays(exp_mz, exp_int_norm)
 
     fig.add_trace(
-        go.Scatter(
+        trace_cls(
             x=x_stems,
             y=y_stems,
             mode="lines",
@@ -662,7 +798,7 @@ def create_annotated_spectrum_plot(
 
     # Add invisible hover points for experimental peaks
     fig.add_trace(
-        go.Scatter(
+        trace_cls(
             x=exp_mz,
             y=exp_int_norm,
             mode="markers",
@@ -697,7 +833,7 @@ def create_annotated_spectrum_plot(
     )
 
     fig.update_xaxes(
-        range=[0, max(exp_mz) * 1.05] if len(exp_mz) > 0 else [0, 2000],
+        range=[0, float(exp_mz.max()) * 1.05] if len(exp_mz) > 0 else [0, 2000],
         showgrid=False,
         linecolor="#888",
         tickcolor="#888",
@@ -731,44 +867,48 @@ def create_annotated_spectrum_plot(
 
 def _draw_matched_ions(
     fig: go.Figure,
-    ions: list[MatchedIon],
-    intensities: list[float],
+    ions: MatchedIonArrays,
+    intensities: np.ndarray,
     color: str,
     legend_name: str,
     flip: bool = False,
     show_in_legend: bool = True,
-    is_theoretical: bool = False,
     show_labels: bool = True,
-) -> None:
-    """Draw matched ion stems, markers, and labels.
+) -> list[dict]:
+    """Draw matched ion stems for one ion type and build their labels.
+
+    Markers and hover text for all ion types are drawn by _draw_ion_markers.
+    Labels are returned rather than added so that the caller can add all
+    layout annotations in one update.
 
     Args:
         fig: Plotly figure to add traces to
-        ions: List of matched ions to draw
+        ions: Matched ions to draw
         intensities: Intensity values (0-100 scale) to use for each ion
-        color: Color for stems, markers, and labels
+        color: Color for stems and labels
         legend_name: Name for the legend entry
         flip: If True, draw downward (negative y). If False, draw upward.
         show_in_legend: Whether to show this trace in the legend
-        is_theoretical: If True, show theoretical info in hover template
         show_labels: If True, show text labels for ion names
+
+    Returns:
+        Layout annotation dicts for the ion labels (empty if show_labels is False)
     """
-    if not ions or not intensities:
-        return
+    if len(ions) == 0 or len(intensities) == 0:
+        return []
 
     sign = -1 if flip else 1
     text_offset = -5 if flip else 5  # Offset increased to accommodate subscript
     text_angle = 0
 
     # Build stems
-    x_stems: list[float | None] = []
-    y_stems: list[float | None] = []
-    for ion, intensity in zip(ions, intensities):
-        x_stems.extend([ion.exp_mz, ion.exp_mz, None])
-        y_stems.extend([0, sign * intensity, None])
+    ion_mz = ions.exp_mz
+    ion_y = sign * np.asarray(intensities, dtype=np.float32)
+    x_stems, y_stems = stem_arrays(ion_mz, ion_y)
+    trace_cls = go.Scattergl if len(ions) > DEFAULTS.WEBGL_POINT_THRESHOLD else go.Scatter
 
     fig.add_trace(
-        go.Scatter(
+        trace_cls(
             x=x_stems,
             y=y_stems,
             mode="lines",
@@ -779,33 +919,62 @@ def _draw_matched_ions(
         )
     )
 
-    # Add markers and labels
-    for ion, intensity in zip(ions, intensities):
-        y_val = sign * intensity
-        formatted_name = format_ion_label_with_superscript(ion.ion_name)
-        if is_theoretical:
-            hover = f"{formatted_name} (theoretical)<br>m/z: {ion.theo_mz:.4f}<br>Intensity: {intensity:.1f}%<extra></extra>"
-        else:
-            hover = f"{formatted_name}<br>m/z: {ion.exp_mz:.4f} (Δ{ion.mz_error:.4f})<br>Intensity: {ion.exp_intensity_pct:.1f}%<extra></extra>"
-        fig.add_trace(
-            go.Scatter(
-                x=[ion.exp_mz],
-                y=[y_val],
-                mode="markers",
-                marker={"color": color, "size": 4},
-                showlegend=False,
-                hovertemplate=hover,
+    if not show_labels:
+        return []
+    font = {"size": 9, "color": color}
+    return [
+        {"x": x, "y": y + text_offset, "text": name, "showarrow": False, "font": font, "textangle": text_angle}
+        for x, y, name in zip(ion_mz.tolist(), ion_y.tolist(), ions.formatted_name.tolist())
+    ]
+
+
+def _draw_ion_markers(
+    fig: go.Figure,
+    ions: MatchedIonArrays,
+    intensities: np.ndarray,
+    colors: list[str],
+    flip: bool = False,
+    is_theoretical: bool = False,
+) -> None:
+    """Draw markers with hover text for matched ions of all types as a single trace.
+
+    Args:
+        fig: Plotly figure to add the trace to
+        ions: Matched ions to draw
+        intensities: Intensity values (0-100 scale) to use for each ion
+        colors: Marker color for each ion
+        flip: If True, draw downward (negative y). If False, draw upward.
+        is_theoretical: If True, show theoretical info in hover template
+    """
+    if len(ions) == 0:
+        return
+
+    ion_y = (-1 if flip else 1) * np.asarray(intensities, dtype=np.float32)
+    formatted_names = ions.formatted_name.tolist()
+    if is_theoretical:
+        hovers = [
+            f"{name} (theoretical)<br>m/z: {mz:.4f}<br>Intensity: {intensity:.1f}%"
+            for name, mz, intensity in zip(formatted_names, ions.theo_mz.tolist(), np.asarray(intensities).tolist())
+        ]
+    else:
+        hovers = [
+            f"{name}<br>m/z: {mz:.4f} (Δ{err:.4f})<br>Intensity: {pct:.1f}%"
+            for name, mz, err, pct in zip(
+                formatted_names, ions.exp_mz.tolist(), ions.mz_error.tolist(), ions.exp_intensity_pct.tolist()
             )
+        ]
+    trace_cls = go.Scattergl if len(ions) > DEFAULTS.WEBGL_POINT_THRESHOLD else go.Scatter
+    fig.add_trace(
+        trace_cls(
+            x=ions.exp_mz,
+            y=ion_y,
+            mode="markers",
+            marker={"color": colors, "size": 4},
+            showlegend=False,
+            text=hovers,
+            hovertemplate="%{text}<extra></extra>",
         )
-        if show_labels:
-            fig.add_annotation(
-                x=ion.exp_mz,
-                y=y_val + text_offset,
-                text=format_ion_label_with_superscript(ion.ion_name),
-                showarrow=False,
-                font={"size": 9, "color": color},
-                textangle=text_angle,
-            )
+    )
 
 
 def _add_annotations_from_data(
@@ -815,29 +984,26 @@ def _add_annotations_from_data(
     show_unmatched: bool,
 ) -> None:
     """Add annotations to figure from pre-computed SpectrumAnnotationData."""
-    # Group matched ions by type
-    matched_by_type: dict[str, list[MatchedIon]] = {}
-    for ion in annotation_data.matched_ions:
-        if ion.ion_type not in matched_by_type:
-            matched_by_type[ion.ion_type] = []
-        matched_by_type[ion.ion_type].append(ion)
+    matched = annotation_data.matched_arrays()
+    unmatched = annotation_data.unmatched_ions
+    if len(matched) == 0 and not unmatched:
+        return
 
     # Compute max theoretical intensity across ALL ions (matched + unmatched) for normalization
-    all_theo_intensities = [ion.theo_intensity for ion in annotation_data.matched_ions]
-    all_theo_intensities += [ion.theo_intensity for ion in annotation_data.unmatched_ions]
-    max_theo_int = max(all_theo_intensities) if all_theo_intensities else 1.0
+    unmatched_int = np.fromiter((ion.theo_intensity for ion in unmatched), dtype=np.float64, count=len(unmatched))
+    max_theo_int = float(np.concatenate([matched.theo_intensity, unmatched_int]).max())
     if max_theo_int <= 0:
         max_theo_int = 1.0
 
+    # Label annotations from all ion groups, added to the layout in one update
+    labels: list[dict] = []
+
     # Add unmatched theoretical ions in mirror mode (downward only)
-    if mirror_mode and show_unmatched and annotation_data.unmatched_ions:
-        x_unmatched: list[float | None] = []
-        y_unmatched: list[float | None] = []
-        for ion in annotation_data.unmatched_ions:
-            # Normalize to 100% scale using global max
-            display_int = (ion.theo_intensity / max_theo_int) * 100
-            x_unmatched.extend([ion.theo_mz, ion.theo_mz, None])
-            y_unmatched.extend([0, -display_int, None])
+    if mirror_mode and show_unmatched and unmatched:
+        unmatched_mz = np.fromiter((ion.theo_mz for ion in unmatched), dtype=np.float64, count=len(unmatched))
+        # Normalize to 100% scale using global max
+        unmatched_int *= 100.0 / max_theo_int
+        x_unmatched, y_unmatched = stem_arrays(unmatched_mz, -unmatched_int)
 
         fig.add_trace(
             go.Scatter(
@@ -852,77 +1018,74 @@ def _add_annotations_from_data(
         )
 
         # Add hover points and annotations for unmatched ions
-        for ion in annotation_data.unmatched_ions:
-            display_int = (ion.theo_intensity / max_theo_int) * 100
-            formatted_name = format_ion_label_with_superscript(ion.ion_name)
-            fig.add_trace(
-                go.Scatter(
-                    x=[ion.theo_mz],
-                    y=[-display_int],
-                    mode="markers",
-                    marker={"color": "gray", "size": 4, "opacity": 0.5},
-                    showlegend=False,
-                    hovertemplate=f"{formatted_name} (theoretical)<br>m/z: {ion.theo_mz:.4f}<br>Intensity: {display_int:.1f}%<extra></extra>",
-                )
+        formatted_names = [ion.formatted_name for ion in unmatched]
+        hovers = [
+            f"{name} (theoretical)<br>m/z: {mz:.4f}<br>Intensity: {display_int:.1f}%"
+            for name, mz, display_int in zip(formatted_names, unmatched_mz.tolist(), unmatched_int.tolist())
+        ]
+        fig.add_trace(
+            go.Scatter(
+                x=unmatched_mz,
+                y=-unmatched_int,
+                mode="markers",
+                marker={"color": "gray", "size": 4, "opacity": 0.5},
+                showlegend=False,
+                text=hovers,
+                hovertemplate="%{text}<extra></extra>",
             )
+        )
 
-            # Add text annotation
-            fig.add_annotation(
-                x=ion.theo_mz,
-                y=-display_int - 5,
-                text=format_ion_label_with_superscript(ion.ion_name),
-                showarrow=False,
-                font={"size": 8, "color": "gray"},
-                textangle=0,
-                opacity=0.6,
-            )
+        # Text annotations
+        font = {"size": 8, "color": "gray"}
+        labels.extend(
+            {
+                "x": mz,
+                "y": -display_int - 5,
+                "text": name,
+                "showarrow": False,
+                "font": font,
+                "textangle": 0,
+                "opacity": 0.6,
+            }
+            for mz, display_int, name in zip(unmatched_mz.tolist(), unmatched_int.tolist(), formatted_names)
+        )
 
-    # Add matched peaks as colored lines grouped by ion type
-    for ion_type, ions in matched_by_type.items():
+    # Add matched peaks as colored lines grouped by ion type (in order of first appearance)
+    theo_intensities = matched.theo_intensity * (100.0 / max_theo_int)
+    for ion_type in dict.fromkeys(matched.ion_type.tolist()):
+        type_mask = matched.ion_type == ion_type
+        ions = matched.select(type_mask)
         color = ION_COLORS.get(ion_type, ION_COLORS["unknown"])
 
-        # Compute experimental intensities (always used for top half / non-mirror)
-        exp_intensities = [ion.exp_intensity_pct for ion in ions]
-
+        # Top half (or non-mirror): experimental intensities with labels (what we measured)
+        labels += _draw_matched_ions(
+            fig,
+            ions,
+            ions.exp_intensity_pct,
+            color,
+            f"{ion_type}-ions",
+            flip=False,
+            show_in_legend=True,
+            show_labels=True,
+        )
         if mirror_mode:
-            # Compute theoretical intensities normalized to 0-100% scale
-            theo_intensities = [(ion.theo_intensity / max_theo_int) * 100 for ion in ions]
-
-            # Mirror mode: draw matched peaks both upward (experimental) and downward (theoretical)
-            # Top half: experimental intensities with labels (what we measured)
+            # Bottom half: theoretical intensities normalized to 0-100%, without labels (what was predicted)
             _draw_matched_ions(
                 fig,
                 ions,
-                exp_intensities,
-                color,
-                f"{ion_type}-ions",
-                flip=False,
-                show_in_legend=True,
-                is_theoretical=False,
-                show_labels=True,
-            )
-            # Bottom half: theoretical intensities without labels (what was predicted)
-            _draw_matched_ions(
-                fig,
-                ions,
-                theo_intensities,
+                theo_intensities[type_mask],
                 color,
                 f"{ion_type}-ions",
                 flip=True,
                 show_in_legend=False,
-                is_theoretical=True,
                 show_labels=False,
             )
-        else:
-            # Non-mirror: draw upward with experimental intensities only
-            _draw_matched_ions(
-                fig,
-                ions,
-                exp_intensities,
-                color,
-                f"{ion_type}-ions",
-                flip=False,
-                show_in_legend=True,
-                is_theoretical=False,
-                show_labels=True,
-            )
+
+    # Markers and hover text for all matched ions, one trace per half
+    colors = [ION_COLORS.get(ion_type, ION_COLORS["unknown"]) for ion_type in matched.ion_type.tolist()]
+    _draw_ion_markers(fig, matched, matched.exp_intensity_pct, colors, flip=False, is_theoretical=False)
+    if mirror_mode:
+        _draw_ion_markers(fig, matched, theo_intensities, colors, flip=True, is_theoretical=True)
+
+    if labels:
+        fig.layout.annotations += tuple(labels)
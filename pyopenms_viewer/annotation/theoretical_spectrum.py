@@ -1,9 +1,15 @@
 """Theoretical spectrum generation for peptide annotation."""
 
+import functools
 from dataclasses import dataclass
 
 from pyopenms import AASequence, MSSpectrum, TheoreticalSpectrumGenerator
 
+# Ion series generated by get_theoretical_spectrum_generator(), keyed by the first
+# character of an ion name; any other ion is "other" (annotations of arbitrary
+# ion series are classified by spectrum_annotator._get_ion_type() instead)
+_THEO_ION_TYPES = {"b": "b", "y": "y", "a": "a"}
+
 
 @dataclass
 class TheoreticalIon:
@@ -40,27 +46,20 @@ class TheoreticalSpectrum:
         return self.get_ions_by_type("a")
 
 
-def generate_theoretical_spectrum(
-    sequence: AASequence,
-    charge: int,
-    add_isotopes: bool = False,
-) -> TheoreticalSpectrum:
-    """Generate theoretical b/y/a ion spectrum for annotation.
+@functools.lru_cache(maxsize=2)
+def get_theoretical_spectrum_generator(add_isotopes: bool = False) -> TheoreticalSpectrumGenerator:
+    """Get a TheoreticalSpectrumGenerator configured for b, y, and a ions with metainfo.
 
-    Uses pyOpenMS TheoreticalSpectrumGenerator to create a theoretical
-    spectrum with b, y, and a ions for the given peptide sequence.
+    One generator is created per configuration and shared, so the parameters
+    are only set up once instead of on every call.
 
     Args:
-        sequence: AASequence object representing the peptide
-        charge: Precursor charge state
         add_isotopes: Whether to add isotope peaks (default: False)
 
     Returns:
-        TheoreticalSpectrum containing all generated ions with m/z, names,
-        types, and intensities
+        Shared, configured TheoreticalSpectrumGenerator; do not change its parameters
     """
     tsg = TheoreticalSpectrumGenerator()
-    spec = MSSpectrum()
 
     # Configure for b, y, and a ions
     params = tsg.getParameters()
@@ -74,49 +73,58 @@ def generate_theoretical_spectrum(
     if add_isotopes:
         params.setValue("add_isotopes", "true")
     tsg.setParameters(params)
+    return tsg
+
+
+def generate_theoretical_spectrum(
+    sequence: AASequence,
+    charge: int,
+    add_isotopes: bool = False,
+) -> TheoreticalSpectrum:
+    """Generate theoretical b/y/a ion spectrum for annotation.
+
+    Uses pyOpenMS TheoreticalSpectrumGenerator to create a theoretical
+    spectrum with b, y, and a ions for the given peptide sequence.
+
+    Args:
+        sequence: AASequence object representing the peptide
+        charge: Precursor charge state
+        add_isotopes: Whether to add isotope peaks (default: False)
+
+    Returns:
+        TheoreticalSpectrum containing all generated ions with m/z, names,
+        types, and intensities
+    """
+    tsg = get_theoretical_spectrum_generator(add_isotopes)
+    spec = MSSpectrum()
 
     # Generate spectrum with charge states up to min(charge, 2)
     tsg.getSpectrum(spec, sequence, 1, min(charge, 2))
 
-    ions = []
-
     # Get ion names from string data arrays
     ion_names = []
     string_arrays = spec.getStringDataArrays()
     for arr in string_arrays:
         arr_name = arr.getName()
         if arr_name == "IonNames" or arr_name == b"IonNames":
-            for name in arr:
-                if isinstance(name, bytes):
-                    ion_names.append(name.decode("utf-8", errors="ignore"))
-                else:
-                    ion_names.append(name)
+            # Fetch all names in one call, handling bytes or string annotations
+            ion_names = [
+                name.decode("utf-8", errors="ignore") if type(name) is bytes else name for name in arr.get_data()
+            ]
             break
 
-    for i in range(len(spec)):
-        mz = spec[i].getMZ()
-        intensity = spec[i].getIntensity()
-        ion_name = ion_names[i] if i < len(ion_names) else ""
-
-        if ion_name.startswith("b"):
-            ion_type = "b"
-        elif ion_name.startswith("y"):
-            ion_type = "y"
-        elif ion_name.startswith("a"):
-            ion_type = "a"
-        elif ion_name:
-            ion_type = "other"
-        else:
-            continue  # Skip peaks without ion names
-
-        ions.append(
-            TheoreticalIon(
-                mz=mz,
-                name=ion_name,
-                ion_type=ion_type,
-                intensity=intensity if intensity > 0 else 1.0,
-            )
+    # Fetch all peaks at once; peaks beyond the named ones have no name and are skipped
+    mz_arr, int_arr = spec.get_peaks()
+    ions = [
+        TheoreticalIon(
+            mz=mz,
+            name=ion_name,
+            ion_type=_THEO_ION_TYPES.get(ion_name[0], "other"),
+            intensity=intensity if intensity > 0 else 1.0,
         )
+        for mz, intensity, ion_name in zip(mz_arr.tolist(), int_arr.tolist(), ion_names)
+        if ion_name
+    ]
 
     return TheoreticalSpectrum(
         ions=ions,
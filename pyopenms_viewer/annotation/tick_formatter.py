@@ -1,6 +1,7 @@
 """Axis tick calculation and formatting utilities."""
 
 import math
+from functools import lru_cache
 
 
 def calculate_nice_ticks(vmin: float, vmax: float, num_ticks: int = 6) -> list[float]:
@@ -38,13 +39,25 @@ def calculate_nice_ticks(vmin: float, vmax: float, num_ticks: int = 6) -> list[f
 
     step = nice_step * pow10
     first_tick = math.ceil(vmin / step) * step
-    ticks = []
-    tick = first_tick
-    while tick <= vmax + step * 0.001:
-        ticks.append(tick)
-        tick += step
+    # Tick count in closed form; each tick is computed from first_tick so
+    # rounding errors do not accumulate across the axis
+    num = math.floor((vmax + step * 0.001 - first_tick) / step) + 1
+    return [first_tick + i * step for i in range(max(num, 0))]
 
-    return ticks
+
+def _format_number(value: float, spec: str) -> str:
+    """Format a number with a format spec, caching recurring tick values.
+
+    The value is converted to a plain float first, so NumPy scalars and 0-d
+    arrays share cache entries with floats, and -0.0 is normalized to 0.0 so
+    that zero is formatted the same way whichever sign was cached first.
+    """
+    return _format_float(float(value) + 0.0, spec)
+
+
+@lru_cache(maxsize=4096)
+def _format_float(value: float, spec: str) -> str:
+    return format(value, spec)
 
 
 def format_tick_label(value: float, range_val: float) -> str:
@@ -61,14 +74,14 @@ def format_tick_label(value: float, range_val: float) -> str:
     """
     if range_val >= 1000:
         if abs(value) >= 1000:
-            return f"{value:.0f}"
-        return f"{value:.1f}"
+            return _format_number(value, ".0f")
+        return _format_number(value, ".1f")
     elif range_val >= 10:
-        return f"{value:.1f}"
+        return _format_number(value, ".1f")
     elif range_val >= 1:
-        return f"{value:.2f}"
+        return _format_number(value, ".2f")
     else:
-        return f"{value:.3f}"
+        return _format_number(value, ".3f")
 
 
 def format_rt_label(rt_seconds: float, in_minutes: bool = False) -> str:
@@ -82,9 +95,9 @@ def format_rt_label(rt_seconds: float, in_minutes: bool = False) -> str:
         Formatted RT string
     """
     if in_minutes:
-        return f"{rt_seconds / 60:.2f}"
+        return _format_number(rt_seconds / 60, ".2f")
     else:
-        return f"{rt_seconds:.1f}"
+        return _format_number(rt_seconds, ".1f")
 
 
 def format_mz_label(mz: float, precision: int = 4) -> str:
@@ -97,7 +110,7 @@ def format_mz_label(mz: float, precision: int = 4) -> str:
     Returns:
         Formatted m/z string
     """
-    return f"{mz:.{precision}f}"
+    return _format_number(mz, f".{precision}f")
 
 
 def format_intensity(intensity: float, scientific: bool = True) -> str:
@@ -111,6 +124,6 @@ def format_intensity(intensity: float, scientific: bool = True) -> str:
         Formatted intensity string
     """
     if scientific:
-        return f"{intensity:.2e}"
+        return _format_number(intensity, ".2e")
     else:
-        return f"{intensity:.0f}"
+        return _format_number(intensity, ".0f")
@@ -93,6 +93,9 @@ class DEFAULTS:
     SHOW_UNMATCHED_THEORETICAL = True
     SHOW_ALL_HITS = False
 
+    # Spectrum plots render with WebGL (Scattergl) above this many points
+    WEBGL_POINT_THRESHOLD = 2000
+
     # 3D view settings
     MAX_3D_PEAKS = 5000
     RT_THRESHOLD_3D = 120.0  # seconds
@@ -91,7 +91,7 @@ class ViewerState:
         self.df: Optional[pd.DataFrame] = None  # All peaks: rt, mz, intensity, log_intensity (~2GB)
         self.im_df: Optional[pd.DataFrame] = None  # Ion mobility peaks: mz, im, intensity, log_intensity
         self.faims_data: dict[float, pd.DataFrame] = {}  # CV -> DataFrame (views into self.df)
-        self.chromatogram_data: dict[int, tuple[np.ndarray, np.ndarray]] = {}  # idx -> (rt, intensity) arrays
+        self.chromatogram_data: dict[str, np.ndarray] = {}  # "rt", "intensity", "starts" (see get_chromatogram)
 
         # ========== OVERLAY DATA ==========
         self.feature_map = None  # PyOpenMS FeatureMap object
@@ -370,6 +370,24 @@ class ViewerState:
         )
         return self.im_df[mask]
 
+    def get_chromatogram(self, idx: int) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        """Get the (rt, intensity) arrays of a chromatogram.
+
+        Args:
+            idx: Chromatogram index in the experiment
+
+        Returns:
+            Views into the shared chromatogram arrays, or None if the
+            chromatogram does not exist or has no points
+        """
+        if not self.chromatogram_data:
+            return None
+        starts = self.chromatogram_data["starts"]
+        if not 0 <= idx < len(starts) - 1 or starts[idx] == starts[idx + 1]:
+            return None
+        start, end = starts[idx], starts[idx + 1]
+        return self.chromatogram_data["rt"][start:end], self.chromatogram_data["intensity"][start:end]
+
     def get_view_bounds(self) -> ViewBounds:
         """Get current view bounds as a ViewBounds object."""
         return ViewBounds(
@@ -12,6 +12,10 @@ def extract_chromatograms(state: ViewerState) -> None:
     metadata in state.chromatograms and data in state.chromatogram_data.
     TIC chromatograms are marked with is_tic=True in metadata.
 
+    All chromatograms share two float32 arrays ("rt", "intensity"); the points
+    of chromatogram ``idx`` are ``starts[idx]:starts[idx + 1]``. Use
+    ViewerState.get_chromatogram() to look one up.
+
     Args:
         state: ViewerState with exp (MSExperiment) already loaded
     """
@@ -29,13 +33,19 @@ def extract_chromatograms(state: ViewerState) -> None:
         return
 
     state.chromatograms = []
-    state.chromatogram_data = {}
+
+    # Offsets of each chromatogram in the shared point arrays
+    starts = np.zeros(len(chroms) + 1, dtype=np.int64)
+    np.cumsum([chrom.size() for chrom in chroms], out=starts[1:])
+    all_rt = np.empty(starts[-1], dtype=np.float32)
+    all_int = np.empty(starts[-1], dtype=np.float32)
 
     for idx, chrom in enumerate(chroms):
         native_id = chrom.getNativeID()
 
-        # Check if this is a TIC chromatogram
-        is_tic = "TIC" in native_id.upper() or "total ion" in native_id.lower()
+        # Check if this is a TIC chromatogram (one case-folded copy for both checks)
+        folded_id = native_id.casefold()
+        is_tic = "tic" in folded_id or "total ion" in folded_id
 
         # Get RT and intensity arrays
         rt_array, int_array = chrom.get_peaks()
@@ -76,10 +86,9 @@ def extract_chromatograms(state: ViewerState) -> None:
         )
 
         # Store data arrays
-        state.chromatogram_data[idx] = (
-            np.array(rt_array, dtype=np.float32),
-            np.array(int_array, dtype=np.float32),
-        )
+        all_rt[starts[idx] : starts[idx + 1]] = rt_array
+        all_int[starts[idx] : starts[idx + 1]] = int_array
 
+    state.chromatogram_data = {"rt": all_rt, "intensity": all_int, "starts": starts}
     state.has_chromatograms = len(state.chromatograms) > 0
     state.selected_chromatogram_indices = []
@@ -2,6 +2,7 @@
 
 from typing import Any
 
+import numpy as np
 from pyopenms import FeatureMap, FeatureXMLFile
 
 from pyopenms_viewer.core.state import ViewerState
@@ -19,42 +20,55 @@ def extract_feature_data(state: ViewerState) -> list[dict[str, Any]]:
     if state.feature_map is None:
         return []
 
-    data = []
+    # Numeric columns are filled into preallocated arrays and converted to
+    # Python scalars in bulk when the rows are built.
+    n_features = state.feature_map.size()
+    rts = np.empty(n_features, dtype=np.float64)
+    mzs = np.empty(n_features, dtype=np.float64)
+    intensities = np.empty(n_features, dtype=np.float64)
+    charges = np.empty(n_features, dtype=np.int64)
+    qualities = np.empty(n_features, dtype=np.float64)
+    rt_widths = np.zeros(n_features, dtype=np.float64)
+    mz_widths = np.zeros(n_features, dtype=np.float64)
+
     for idx, feature in enumerate(state.feature_map):
-        rt = feature.getRT()
-        mz = feature.getMZ()
-        intensity = feature.getIntensity()
-        charge = feature.getCharge()
-        quality = feature.getOverallQuality()
+        rts[idx] = feature.getRT()
+        mzs[idx] = feature.getMZ()
+        intensities[idx] = feature.getIntensity()
+        charges[idx] = feature.getCharge()
+        qualities[idx] = feature.getOverallQuality()
 
+        # Hull points come back as (N, 2) numpy arrays of (rt, mz)
         hulls = feature.getConvexHulls()
-        rt_width = 0
-        mz_width = 0
         if hulls:
-            all_points = []
-            for hull in hulls:
-                points = hull.getHullPoints()
-                all_points.extend([(p[0], p[1]) for p in points])
-            if all_points:
-                rt_coords = [p[0] for p in all_points]
-                mz_coords = [p[1] for p in all_points]
-                rt_width = max(rt_coords) - min(rt_coords)
-                mz_width = max(mz_coords) - min(mz_coords)
-
-        data.append(
-            {
-                "idx": idx,
-                "rt": round(rt, 2),
-                "mz": round(mz, 4),
-                "intensity": f"{intensity:.2e}",
-                "charge": charge if charge != 0 else "-",
-                "quality": round(quality, 3) if quality > 0 else "-",
-                "rt_width": round(rt_width, 2) if rt_width > 0 else "-",
-                "mz_width": round(mz_width, 4) if mz_width > 0 else "-",
-            }
+            points = np.concatenate([hull.getHullPoints() for hull in hulls])
+            if len(points):
+                rt_widths[idx] = points[:, 0].max() - points[:, 0].min()
+                mz_widths[idx] = points[:, 1].max() - points[:, 1].min()
+
+    return [
+        {
+            "idx": idx,
+            "rt": round(rt, 2),
+            "mz": round(mz, 4),
+            "intensity": f"{intensity:.2e}",
+            "charge": charge if charge != 0 else "-",
+            "quality": round(quality, 3) if quality > 0 else "-",
+            "rt_width": round(rt_width, 2) if rt_width > 0 else "-",
+            "mz_width": round(mz_width, 4) if mz_width > 0 else "-",
+        }
+        for idx, (rt, mz, intensity, charge, quality, rt_width, mz_width) in enumerate(
+            zip(
+                rts.tolist(),
+                mzs.tolist(),
+                intensities.tolist(),
+                charges.tolist(),
+                qualities.tolist(),
+                rt_widths.tolist(),
+                mz_widths.tolist(),
+            )
         )
-
-    return data
+    ]
 
 
 class FeatureLoader:
@@ -66,59 +66,30 @@ def link_ids_to_spectra(state: ViewerState, rt_tolerance: float = 5.0, mz_tolera
     if not state.peptide_ids or not state.spectrum_data:
         return
 
-    # Collect unique meta value keys from all IDs
+    # Single pass over the IDs: collect the hit data for matching and, on the
+    # way, the unique meta value keys (PeptideIdentification keys and the keys
+    # of each ID's best hit). Consecutive IDs usually share the same keys, so
+    # the key set is only updated when they change.
     meta_keys_set = set()
-    for pep_id in state.peptide_ids:
-        # Get PeptideIdentification meta values
+    last_pid_keys = None
+    last_hit_keys = None
+    id_entries = []
+    for id_idx, pep_id in enumerate(state.peptide_ids):
+        # Collect PeptideIdentification meta values
+        pid_meta_values = {}
         pid_keys = []
         pep_id.getKeys(pid_keys)
-        for key in pid_keys:
-            meta_keys_set.add(f"pid:{key.decode() if isinstance(key, bytes) else key}")
-
-        # Get PeptideHit meta values
-        hits = pep_id.getHits()
-        if hits:
-            hit_keys = []
-            hits[0].getKeys(hit_keys)
-            for key in hit_keys:
-                meta_keys_set.add(f"hit:{key.decode() if isinstance(key, bytes) else key}")
-
-    state.id_meta_keys = sorted(meta_keys_set)
-
-    # Clear existing ID info from spectrum data
-    for spec_row in state.spectrum_data:
-        spec_row["sequence"] = "-"
-        spec_row["full_sequence"] = ""
-        spec_row["score"] = "-"
-        spec_row["id_idx"] = None
-        spec_row["hit_rank"] = "-"
-        spec_row["all_hits"] = []
-        # Initialize meta value fields
-        for meta_key in state.id_meta_keys:
-            spec_row[meta_key] = "-"
-
-    # Build index of MS2 spectra by RT for faster matching
-    ms2_spectra = []
-    for spec_row in state.spectrum_data:
-        if spec_row["ms_level"] > 1:
-            ms2_spectra.append(spec_row)
-
-    # For each ID, find matching spectrum
-    for id_idx, pep_id in enumerate(state.peptide_ids):
-        id_rt = pep_id.getRT()
-        id_mz = pep_id.getMZ()
+        pid_keys = tuple(key.decode() if isinstance(key, bytes) else key for key in pid_keys)
+        if pid_keys != last_pid_keys:
+            meta_keys_set.update(f"pid:{key}" for key in pid_keys)
+            last_pid_keys = pid_keys
 
         hits = pep_id.getHits()
         if not hits:
             continue
 
-        # Collect PeptideIdentification meta values
-        pid_meta_values = {}
-        pid_keys = []
-        pep_id.getKeys(pid_keys)
-        for key in pid_keys:
-            key_str = key.decode() if isinstance(key, bytes) else key
-            value = pep_id.getMetaValue(key)
+        for key_str in pid_keys:
+            value = pep_id.getMetaValue(key_str)
             if isinstance(value, bytes):
                 value = value.decode()
             elif isinstance(value, float):
@@ -136,9 +107,12 @@ def link_ids_to_spectra(state: ViewerState, rt_tolerance: float = 5.0, mz_tolera
             hit_meta_values = dict(pid_meta_values)
             hit_keys = []
             hit.getKeys(hit_keys)
-            for key in hit_keys:
-                key_str = key.decode() if isinstance(key, bytes) else key
-                value = hit.getMetaValue(key)
+            hit_keys = tuple(key.decode() if isinstance(key, bytes) else key for key in hit_keys)
+            if hit_idx == 0 and hit_keys != last_hit_keys:
+                meta_keys_set.update(f"hit:{key}" for key in hit_keys)
+                last_hit_keys = hit_keys
+            for key_str in hit_keys:
+                value = hit.getMetaValue(key_str)
                 if isinstance(value, bytes):
                     value = value.decode()
                 elif isinstance(value, float):
@@ -158,6 +132,30 @@ def link_ids_to_spectra(state: ViewerState, rt_tolerance: float = 5.0, mz_tolera
                 }
             )
 
+        id_entries.append((id_idx, pep_id.getRT(), pep_id.getMZ(), all_hits_data))
+
+    state.id_meta_keys = sorted(meta_keys_set)
+
+    # Clear existing ID info from spectrum data
+    for spec_row in state.spectrum_data:
+        spec_row["sequence"] = "-"
+        spec_row["full_sequence"] = ""
+        spec_row["score"] = "-"
+        spec_row["id_idx"] = None
+        spec_row["hit_rank"] = "-"
+        spec_row["all_hits"] = []
+        # Initialize meta value fields
+        for meta_key in state.id_meta_keys:
+            spec_row[meta_key] = "-"
+
+    # Build index of MS2 spectra by RT for faster matching
+    ms2_spectra = []
+    for spec_row in state.spectrum_data:
+        if spec_row["ms_level"] > 1:
+            ms2_spectra.append(spec_row)
+
+    # For each ID, find matching spectrum
+    for id_idx, id_rt, id_mz, all_hits_data in id_entries:
         # Find matching spectrum
         best_match = None
         best_rt_diff = float("inf")
@@ -1,12 +1,14 @@
 """Ion mobility data extraction from mzML experiments."""
 
+from typing import Optional
+
 import numpy as np
 import pandas as pd
 
 from pyopenms_viewer.core.state import ViewerState
 
 
-def extract_ion_mobility_data(state: ViewerState) -> None:
+def extract_ion_mobility_data(state: ViewerState, total_ms1_peaks: Optional[int] = None) -> None:
     """Extract ion mobility data from spectra that contain IM arrays.
 
     For IM data, each spectrum stores a whole frame with concatenated peaks
@@ -17,6 +19,8 @@ def extract_ion_mobility_data(state: ViewerState) -> None:
 
     Args:
         state: ViewerState with exp (MSExperiment) already loaded
+        total_ms1_peaks: Number of peaks in all MS1 spectra, if already known;
+            counted from state.exp otherwise
     """
     if state.exp is None:
         state.has_ion_mobility = False
@@ -65,17 +69,23 @@ def extract_ion_mobility_data(state: ViewerState) -> None:
         state.im_type = "ion_mobility"
         state.im_unit = ""
 
-    # Second pass: extract all IM data
-    all_mz = []
-    all_im = []
-    all_int = []
+    # Second pass: extract all IM data straight into buffers sized for every MS1
+    # peak; spectra without a matching IM array are skipped, so the buffers are
+    # trimmed to the filled length afterwards.
+    if total_ms1_peaks is None:
+        total_ms1_peaks = sum(len(spec) for spec in state.exp if spec.getMSLevel() == 1)
+    mz_concat = np.empty(total_ms1_peaks, dtype=np.float32)
+    im_concat = np.empty(total_ms1_peaks, dtype=np.float32)
+    int_concat = np.empty(total_ms1_peaks, dtype=np.float32)
+    idx = 0
 
     for spec in state.exp:
         if spec.getMSLevel() != 1:
             continue
 
         mz_array, int_array = spec.get_peaks()
-        if len(mz_array) == 0:
+        n = len(mz_array)
+        if n == 0:
             continue
 
         # Find the IM array
@@ -83,54 +93,51 @@ def extract_ion_mobility_data(state: ViewerState) -> None:
         float_arrays = spec.getFloatDataArrays()
         for fda in float_arrays:
             if fda.getName() == detected_im_name:
-                im_array = np.array(fda.get_data(), dtype=np.float32)
+                im_array = fda.get_data()
                 break
 
-        if im_array is None or len(im_array) != len(mz_array):
+        if im_array is None or len(im_array) != n:
             continue
 
-        all_mz.append(mz_array)
-        all_im.append(im_array)
-        all_int.append(int_array)
+        mz_concat[idx : idx + n] = mz_array
+        im_concat[idx : idx + n] = im_array
+        int_concat[idx : idx + n] = int_array
+        idx += n
 
-    if not all_mz:
+    if idx == 0:
         state.has_ion_mobility = False
         state.im_df = None
         return
 
-    # Concatenate all arrays
-    mz_concat = np.concatenate(all_mz)
-    im_concat = np.concatenate(all_im)
-    int_concat = np.concatenate(all_int)
+    if idx < total_ms1_peaks:
+        mz_concat = mz_concat[:idx]
+        im_concat = im_concat[:idx]
+        int_concat = int_concat[:idx]
 
-    # Create DataFrame
+    # Create DataFrame from the float32 buffers without copying them
     im_df = pd.DataFrame(
         {
             "mz": mz_concat,
             "im": im_concat,
             "intensity": int_concat,
-        }
+            "log_intensity": np.log1p(int_concat, dtype=np.float32),
+        },
+        copy=False,
     )
-    im_df["log_intensity"] = np.log1p(im_df["intensity"])
 
     # Register with data manager if available (handles both in-memory and out-of-core)
     if state.data_manager is not None and state.current_file:
         # data_manager.register_im_peaks returns DataFrame for in-memory, None for out-of-core
         state.im_df = state.data_manager.register_im_peaks(im_df, state.current_file)
-
-        # Get bounds from data manager
-        im_bounds = state.data_manager.get_im_bounds()
-        state.im_min = im_bounds["im_min"]
-        state.im_max = im_bounds["im_max"]
-        im_mz_min = im_bounds["mz_min"]
-        im_mz_max = im_bounds["mz_max"]
     else:
         # Legacy: no data manager, keep DataFrame in state
         state.im_df = im_df
-        state.im_min = float(im_df["im"].min())
-        state.im_max = float(im_df["im"].max())
-        im_mz_min = float(im_df["mz"].min())
-        im_mz_max = float(im_df["mz"].max())
+
+    # Bounds straight from the buffers (works for both modes)
+    state.im_min = float(im_concat.min())
+    state.im_max = float(im_concat.max())
+    im_mz_min = float(mz_concat.min())
+    im_mz_max = float(mz_concat.max())
 
     # Ensure valid IM range
     if state.im_max <= state.im_min:
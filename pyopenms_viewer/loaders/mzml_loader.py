@@ -21,6 +21,13 @@ from pyopenms_viewer.core.state import ViewerState
 # Regex to extract CV from filter string (e.g., "cv=-45.00" or "cv=0.00")
 _CV_FILTER_PATTERN = re.compile(r"\bcv=(-?\d+(?:\.\d+)?)\b", re.IGNORECASE)
 
+# Metadata names that may hold the FAIMS CV, in order of preference
+_CV_META_NAMES = (
+    "FAIMS compensation voltage",
+    "ion mobility drift time",
+    "MS:1001581",  # CV accession for FAIMS CV
+)
+
 
 def get_cv_from_spectrum(spec) -> Optional[float]:
     """Extract FAIMS compensation voltage from spectrum metadata.
@@ -38,36 +45,44 @@ def get_cv_from_spectrum(spec) -> Optional[float]:
     Note: pyOpenMS 3.5 includes performance improvements (7-25% faster mzML loading
     via SIMD ASCII conversion, 20-40% faster ion mobility data loading).
     """
+    return _lookup_cv(spec, _CV_META_NAMES)[0]
+
+
+def _lookup_cv(spec, meta_names: tuple[str, ...]) -> tuple[Optional[float], Optional[str]]:
+    """Look up the FAIMS CV of a spectrum as described in get_cv_from_spectrum().
+
+    Args:
+        spec: MSSpectrum object
+        meta_names: Spectrum metadata names to try, in order
+
+    Returns:
+        Tuple of (CV or None, spectrum metadata name the CV was read from or None)
+    """
     # Primary method: use DriftTimeUnit (most reliable for properly annotated mzML)
     try:
         if spec.getDriftTimeUnit() == DriftTimeUnit.FAIMS_COMPENSATION_VOLTAGE:
             cv = spec.getDriftTime()
             if cv != 0.0 or spec.getDriftTime() == 0.0:  # 0.0 can be valid CV
-                return float(cv)
+                return float(cv), None
     except Exception:
         pass
 
     # Fallback: Try common CV metadata names
-    cv_names = [
-        "FAIMS compensation voltage",
-        "ion mobility drift time",
-        "MS:1001581",  # CV accession for FAIMS CV
-    ]
-    for name in cv_names:
+    for name in meta_names:
         if spec.metaValueExists(name):
             try:
-                return float(spec.getMetaValue(name))
+                return float(spec.getMetaValue(name)), name
             except (ValueError, TypeError):
-                pass
+                continue
 
     # Fallback: Check in acquisition info
     try:
         acq = spec.getAcquisitionInfo()
         if acq:
             for a in acq:
-                for name in cv_names:
+                for name in _CV_META_NAMES:
                     if a.metaValueExists(name):
-                        return float(a.getMetaValue(name))
+                        return float(a.getMetaValue(name)), None
     except Exception:
         pass
 
@@ -79,11 +94,11 @@ def get_cv_from_spectrum(spec) -> Optional[float]:
                 filter_str = filter_str.decode()
             match = _CV_FILTER_PATTERN.search(filter_str)
             if match:
-                return float(match.group(1))
+                return float(match.group(1)), None
         except Exception:
             pass
 
-    return None
+    return None, None
 
 
 class MzMLLoader:
@@ -152,58 +167,73 @@ class MzMLLoader:
         try:
             if self.state.exp is None:
                 return False
-
-            total_peaks = sum(len(spec) for spec in self.state.exp)
-
+            exp = self.state.exp
+
+            # Single survey pass for MS level and peak count per spectrum; totals,
+            # buffer sizes and the TIC source are derived from these arrays instead
+            # of re-iterating the experiment.
+            n_spectra = len(exp)
+            # The FAIMS CV of every spectrum is looked up here once and reused by the
+            # peak extraction and the spectrum table. A file normally stores the CV
+            # under one metadata name, so the name that last matched is tried first
+            # for the following spectra of this file.
+            ms_levels = np.empty(n_spectra, dtype=np.int32)
+            peak_counts = np.empty(n_spectra, dtype=np.int64)
+            spectrum_cvs = [None] * n_spectra
+            cv_meta_names = _CV_META_NAMES
+            for i, spec in enumerate(exp):
+                ms_levels[i] = spec.getMSLevel()
+                peak_counts[i] = len(spec)
+                spectrum_cvs[i], meta_name = _lookup_cv(spec, cv_meta_names)
+                if meta_name is not None and meta_name != cv_meta_names[0]:
+                    cv_meta_names = (meta_name, *(name for name in _CV_META_NAMES if name != meta_name))
+
+            total_peaks = int(peak_counts.sum())
             if total_peaks == 0:
                 return False
 
-            # First pass: detect FAIMS CVs
-            if progress_callback:
-                progress_callback("Detecting FAIMS CVs...", 0.05)
-
+            # Data structures for peak extraction, sized exactly for the MS1 peaks.
+            # Spectrum i owns peak_offsets[i]:peak_offsets[i + 1] of the buffers
+            # (an empty range unless it is MS1).
+            ms1_peak_counts = np.where(ms_levels == 1, peak_counts, 0)
+            peak_offsets = np.zeros(n_spectra + 1, dtype=np.int64)
+            np.cumsum(ms1_peak_counts, out=peak_offsets[1:])
+            total_ms1_peaks = int(peak_offsets[-1])
+            rts = np.empty(total_ms1_peaks, dtype=np.float32)
+            mzs = np.empty(total_ms1_peaks, dtype=np.float32)
+            intensities = np.empty(total_ms1_peaks, dtype=np.float32)
+            offsets = peak_offsets.tolist()
+
+            # FAIMS CVs are collected during peak extraction
             cv_set = set()
-            for spec in self.state.exp:
-                if spec.getMSLevel() == 1:
-                    cv = get_cv_from_spectrum(spec)
-                    if cv is not None:
-                        cv_set.add(cv)
 
-            self.state.has_faims = len(cv_set) > 1
-            self.state.faims_cvs = sorted(cv_set) if self.state.has_faims else []
-
-            # Data structures for peak extraction
-            rts = np.empty(total_peaks, dtype=np.float32)
-            mzs = np.empty(total_peaks, dtype=np.float32)
-            intensities = np.empty(total_peaks, dtype=np.float32)
-            cvs = np.empty(total_peaks, dtype=np.float32) if self.state.has_faims else None
-
-            # TIC computation
+            # TIC computation (tic_cvs holds the CV of each TIC point)
             tic_rts = []
             tic_intensities = []
-            faims_tic_data = {cv: {"rt": [], "int": []} for cv in self.state.faims_cvs} if self.state.has_faims else {}
+            tic_cvs = []
 
             if progress_callback:
                 progress_callback("Extracting peaks...", 0.1)
 
-            idx = 0
             ms1_count = 0
-            total_ms1 = sum(1 for spec in self.state.exp if spec.getMSLevel() == 1)
+
+            total_ms1 = int(np.count_nonzero(ms_levels == 1))
 
             # Determine TIC source: MS1 TIC or fallback to MS2+ BPC
             if total_ms1 > 0:
                 tic_ms_level = 1
                 self.state.tic_source = "MS1 TIC"
             else:
-                ms_levels = {spec.getMSLevel() for spec in self.state.exp}
-                tic_ms_level = min(lv for lv in ms_levels if lv > 1) if ms_levels else 2
+                higher_levels = ms_levels[ms_levels > 1]
+                tic_ms_level = int(higher_levels.min()) if len(higher_levels) else 2
                 self.state.tic_source = f"MS{tic_ms_level} BPC"
 
-            total_tic_spectra = sum(1 for spec in self.state.exp if spec.getMSLevel() == tic_ms_level)
+            total_tic_spectra = int(np.count_nonzero(ms_levels == tic_ms_level))
 
-            for spec in self.state.exp:
-                if spec.getMSLevel() != tic_ms_level:
-                    if tic_ms_level == 1 or spec.getMSLevel() != 1:
+            for spec_idx, spec in enumerate(exp):
+                ms_level = ms_levels[spec_idx]
+                if ms_level != tic_ms_level:
+                    if tic_ms_level == 1 or ms_level != 1:
                         continue
 
                 ms1_count += 1
@@ -214,46 +244,59 @@ class MzMLLoader:
                 rt = spec.getRT()
                 mz_array, int_array = spec.get_peaks()
                 n = len(mz_array)
+                is_ms1 = ms_level == 1
 
-                cv = get_cv_from_spectrum(spec) if self.state.has_faims else None
+                # FAIMS CVs are only taken from MS1 spectra
+                cv = spectrum_cvs[spec_idx] if is_ms1 else None
+                if cv is not None:
+                    cv_set.add(cv)
 
                 if n > 0:
                     # Only add to peak map DataFrame if MS1
-                    if spec.getMSLevel() == 1:
-                        rts[idx : idx + n] = rt
-                        mzs[idx : idx + n] = mz_array
-                        intensities[idx : idx + n] = int_array
-                        if self.state.has_faims and cv is not None:
-                            cvs[idx : idx + n] = cv
-                        idx += n
-
-                    # TIC/BPC calculation
-                    if tic_ms_level == 1:
-                        tic_value = float(np.sum(int_array))
-                    else:
-                        tic_value = float(np.max(int_array))
+                    if is_ms1:
+                        start, end = offsets[spec_idx], offsets[spec_idx + 1]
+                        rts[start:end] = rt
+                        mzs[start:end] = mz_array
+                        intensities[start:end] = int_array
+
+                    # TIC/BPC calculation; the MS1 TIC is summed for all spectra at once after the loop
+                    if tic_ms_level != 1:
+                        tic_intensities.append(float(np.max(int_array)))
 
                     tic_rts.append(rt)
-                    tic_intensities.append(tic_value)
+                    tic_cvs.append(cv)
 
-                    # Per-CV TIC
-                    if self.state.has_faims and cv is not None:
-                        faims_tic_data[cv]["rt"].append(rt)
-                        faims_tic_data[cv]["int"].append(tic_value)
+            self.state.has_faims = len(cv_set) > 1
+            self.state.faims_cvs = sorted(cv_set) if self.state.has_faims else []
+
+            # MS1 spectra that contributed peaks, in buffer order
+            filled_spectra = np.flatnonzero(ms1_peak_counts)
 
-            # Trim arrays
-            rts = rts[:idx]
-            mzs = mzs[:idx]
-            intensities = intensities[:idx]
             if self.state.has_faims:
-                cvs = cvs[:idx]
+                # Per-peak CV as a categorical over faims_cvs: small integer codes
+                # instead of a float per peak (-1 marks spectra without a CV)
+                cv_codes = {cv: code for code, cv in enumerate(self.state.faims_cvs)}
+                code_dtype = np.int8 if len(cv_codes) < 128 else np.int16
+                spec_codes = np.fromiter(
+                    (cv_codes.get(spectrum_cvs[i], -1) for i in filled_spectra.tolist()),
+                    dtype=code_dtype,
+                    count=len(filled_spectra),
+                )
+                cvs = pd.Categorical.from_codes(
+                    np.repeat(spec_codes, ms1_peak_counts[filled_spectra]), categories=self.state.faims_cvs
+                )
 
             if progress_callback:
                 progress_callback("Building TIC...", 0.75)
 
             # Store TIC data (sorted by RT)
             tic_rt_arr = np.array(tic_rts, dtype=np.float32)
-            tic_int_arr = np.array(tic_intensities, dtype=np.float32)
+            if tic_ms_level == 1 and len(filled_spectra):
+                # Every TIC point is a copied MS1 spectrum: sum each spectrum's slice of the peak buffer
+                starts = peak_offsets[filled_spectra]
+                tic_int_arr = np.add.reduceat(intensities, starts, dtype=np.float64).astype(np.float32)
+            else:
+                tic_int_arr = np.array(tic_intensities, dtype=np.float32)
             sort_idx = np.argsort(tic_rt_arr)
             self.state.tic_rt = tic_rt_arr[sort_idx]
             self.state.tic_intensity = tic_int_arr[sort_idx]
@@ -261,8 +304,9 @@ class MzMLLoader:
             # Store per-CV TIC data
             self.state.faims_tic = {}
             for cv in self.state.faims_cvs:
-                cv_rt = np.array(faims_tic_data[cv]["rt"], dtype=np.float32)
-                cv_int = np.array(faims_tic_data[cv]["int"], dtype=np.float32)
+                cv_mask = np.fromiter((c == cv for c in tic_cvs), dtype=bool, count=len(tic_cvs))
+                cv_rt = tic_rt_arr[cv_mask]
+                cv_int = tic_int_arr[cv_mask]
                 cv_sort_idx = np.argsort(cv_rt)
                 self.state.faims_tic[cv] = (cv_rt[cv_sort_idx], cv_int[cv_sort_idx])
 
@@ -280,7 +324,7 @@ class MzMLLoader:
             # Extract ion mobility data
             from pyopenms_viewer.loaders.ion_mobility_loader import extract_ion_mobility_data
 
-            extract_ion_mobility_data(self.state)
+            extract_ion_mobility_data(self.state, total_ms1_peaks)
 
             if progress_callback:
                 progress_callback("Extracting spectrum metadata...", 0.8)
@@ -288,16 +332,23 @@ class MzMLLoader:
             # Extract spectrum metadata
             from pyopenms_viewer.loaders.spectrum_extractor import extract_spectrum_data
 
-            self.state.spectrum_data = extract_spectrum_data(self.state)
+            self.state.spectrum_data = extract_spectrum_data(self.state, spectrum_cvs)
 
             if progress_callback:
                 progress_callback("Creating DataFrame...", 0.85)
 
-            # Create main DataFrame
-            df = pd.DataFrame({"rt": rts, "mz": mzs, "intensity": intensities})
+            # Peak bounds straight from the buffers (no DataFrame or SQL scan needed)
+            if rts.size:
+                peak_bounds = (float(rts.min()), float(rts.max()), float(mzs.min()), float(mzs.max()))
+            else:
+                peak_bounds = (0.0, 0.0, 0.0, 0.0)
+
+            # Create main DataFrame in one shot from the already-owned buffers
+            columns = {"rt": rts, "mz": mzs, "intensity": intensities}
             if self.state.has_faims:
-                df["cv"] = cvs
-            df["log_intensity"] = np.log1p(df["intensity"])
+                columns["cv"] = cvs
+            columns["log_intensity"] = np.log1p(intensities, dtype=np.float32)
+            df = pd.DataFrame(columns, copy=False)
 
             if progress_callback:
                 progress_callback("Registering with data manager...", 0.88)
@@ -307,12 +358,7 @@ class MzMLLoader:
                 # data_manager.register_peaks returns DataFrame for in-memory, None for out-of-core
                 self.state.df = self.state.data_manager.register_peaks(df, filepath)
 
-                # Get bounds from data manager (works for both modes)
-                bounds = self.state.data_manager.get_bounds()
-                self.state.rt_min = bounds["rt_min"]
-                self.state.rt_max = bounds["rt_max"]
-                self.state.mz_min = bounds["mz_min"]
-                self.state.mz_max = bounds["mz_max"]
+                self.state.rt_min, self.state.rt_max, self.state.mz_min, self.state.mz_max = peak_bounds
             else:
                 # Legacy: no data manager, keep DataFrame in state
                 self.state.df = df
@@ -323,16 +369,13 @@ class MzMLLoader:
             # Create per-CV DataFrames for FAIMS view (only in-memory mode)
             self.state.faims_data = {}
             if self.state.has_faims and self.state.df is not None:
-                for cv in self.state.faims_cvs:
-                    cv_df = self.state.df[self.state.df["cv"] == cv].copy()
-                    self.state.faims_data[cv] = cv_df
+                # One groupby pass over the categorical codes partitions the peaks; the
+                # group keys are the exact faims_cvs values, CVs without peaks included
+                self.state.faims_data = dict(list(self.state.df.groupby("cv", observed=False)))
 
             # Set bounds from peak data (fallback if data_manager not used)
-            if self.state.data_manager is None and self.state.df is not None and len(self.state.df) > 0:
-                self.state.rt_min = float(self.state.df["rt"].min())
-                self.state.rt_max = float(self.state.df["rt"].max())
-                self.state.mz_min = float(self.state.df["mz"].min())
-                self.state.mz_max = float(self.state.df["mz"].max())
+            if self.state.data_manager is None and rts.size:
+                self.state.rt_min, self.state.rt_max, self.state.mz_min, self.state.mz_max = peak_bounds
             elif self.state.data_manager is None:
                 # Fall back to IM data or spectrum metadata
                 if self.state.has_ion_mobility and self.state.im_df is not None and len(self.state.im_df) > 0:
@@ -359,7 +402,7 @@ class MzMLLoader:
             self.state.view_mz_max = self.state.mz_max
 
             # Auto-enable downsampling if any spectrum has more than 10000 peaks
-            max_peaks_per_spectrum = max((len(spec) for spec in self.state.exp), default=0)
+            max_peaks_per_spectrum = int(peak_counts.max())
             if max_peaks_per_spectrum > 10000:
                 self.state.peakmap_downsampling = True
 
@@ -1,6 +1,6 @@
 """Spectrum metadata extraction from mzML experiments."""
 
-from typing import Any
+from typing import Any, Optional
 
 import numpy as np
 
@@ -8,7 +8,7 @@ from pyopenms_viewer.core.state import ViewerState
 from pyopenms_viewer.loaders.mzml_loader import get_cv_from_spectrum
 
 
-def extract_spectrum_data(state: ViewerState) -> list[dict[str, Any]]:
+def extract_spectrum_data(state: ViewerState, cvs: Optional[list[Optional[float]]] = None) -> list[dict[str, Any]]:
     """Extract spectrum metadata for the unified spectrum table.
 
     Includes fields for ID info (sequence, score) which are populated
@@ -16,6 +16,8 @@ def extract_spectrum_data(state: ViewerState) -> list[dict[str, Any]]:
 
     Args:
         state: ViewerState with exp (MSExperiment) already loaded
+        cvs: FAIMS CV of each spectrum if already known (e.g. from
+            MzMLLoader.process); looked up per spectrum otherwise
 
     Returns:
         List of spectrum metadata dictionaries
@@ -23,53 +25,81 @@ def extract_spectrum_data(state: ViewerState) -> list[dict[str, Any]]:
     if state.exp is None:
         return []
 
-    data = []
-    for idx in range(len(state.exp)):
-        spec = state.exp[idx]
-        rt = spec.getRT()
-        ms_level = spec.getMSLevel()
-        n_peaks = len(spec)
+    # Numeric columns are collected into preallocated arrays in one pass and
+    # converted to Python scalars in bulk when the rows are built.
+    n_spectra = len(state.exp)
+    rts = np.empty(n_spectra, dtype=np.float64)
+    ms_levels = np.empty(n_spectra, dtype=np.int32)
+    n_peaks_arr = np.empty(n_spectra, dtype=np.int64)
+    tics = np.zeros(n_spectra, dtype=np.float64)
+    bpis = np.zeros(n_spectra, dtype=np.float64)
+    mz_mins = np.zeros(n_spectra, dtype=np.float64)
+    mz_maxs = np.zeros(n_spectra, dtype=np.float64)
+    precursor_mzs = ["-"] * n_spectra
+    precursor_charges = ["-"] * n_spectra
+    lookup_cvs = cvs is None
+    if lookup_cvs:
+        cvs = [None] * n_spectra
 
-        # Get peaks for TIC and BPI calculation
-        mz_array, int_array = spec.get_peaks()
-        tic = float(np.sum(int_array)) if len(int_array) > 0 else 0
-        bpi = float(np.max(int_array)) if len(int_array) > 0 else 0
+    for idx, spec in enumerate(state.exp):
+        rts[idx] = spec.getRT()
+        ms_level = spec.getMSLevel()
+        ms_levels[idx] = ms_level
+        n_peaks_arr[idx] = len(spec)
 
-        # Get m/z range
-        mz_min = float(mz_array.min()) if len(mz_array) > 0 else 0
-        mz_max = float(mz_array.max()) if len(mz_array) > 0 else 0
+        # TIC, BPI and m/z range are computed in C++ without copying the peaks
+        # out with get_peaks(); ranges are refreshed since in-memory spectra
+        # (e.g. built programmatically) may not have them set.
+        if n_peaks_arr[idx] > 0:
+            spec.updateRanges()
+            tics[idx] = spec.calculateTIC()
+            bpis[idx] = spec.getMaxIntensity()
+            mz_mins[idx] = spec.getMinMZ()
+            mz_maxs[idx] = spec.getMaxMZ()
 
         # Get precursor info for MS2+
-        precursor_mz = "-"
-        precursor_charge = "-"
         if ms_level > 1:
             precursors = spec.getPrecursors()
             if precursors:
-                precursor_mz = round(precursors[0].getMZ(), 4)
+                precursor_mzs[idx] = round(precursors[0].getMZ(), 4)
                 charge = precursors[0].getCharge()
-                precursor_charge = charge if charge > 0 else "-"
+                if charge > 0:
+                    precursor_charges[idx] = charge
 
         # Get FAIMS CV if available (stored as float, None if not available)
-        cv = get_cv_from_spectrum(spec)
+        if lookup_cvs:
+            cvs[idx] = get_cv_from_spectrum(spec)
 
-        data.append(
-            {
-                "idx": idx,
-                "rt": round(rt, 2),
-                "ms_level": ms_level,
-                "cv": cv,
-                "n_peaks": n_peaks,
-                "tic": f"{tic:.2e}",
-                "bpi": f"{bpi:.2e}",
-                "mz_range": f"{mz_min:.1f}-{mz_max:.1f}" if n_peaks > 0 else "-",
-                "precursor_mz": precursor_mz,
-                "precursor_z": precursor_charge,
-                # ID fields - populated by link_ids_to_spectra()
-                "sequence": "-",
-                "full_sequence": "",
-                "score": "-",
-                "id_idx": None,
-            }
+    return [
+        {
+            "idx": idx,
+            "rt": round(rt, 2),
+            "ms_level": ms_level,
+            "cv": cv,
+            "n_peaks": n_peaks,
+            "tic": f"{tic:.2e}",
+            "bpi": f"{bpi:.2e}",
+            "mz_range": f"{mz_min:.1f}-{mz_max:.1f}" if n_peaks > 0 else "-",
+            "precursor_mz": precursor_mz,
+            "precursor_z": precursor_charge,
+            # ID fields - populated by link_ids_to_spectra()
+            "sequence": "-",
+            "full_sequence": "",
+            "score": "-",
+            "id_idx": None,
+        }
+        for idx, (rt, ms_level, cv, n_peaks, tic, bpi, mz_min, mz_max, precursor_mz, precursor_charge) in enumerate(
+            zip(
+                rts.tolist(),
+                ms_levels.tolist(),
+                cvs,
+                n_peaks_arr.tolist(),
+                tics.tolist(),
+                bpis.tolist(),
+                mz_mins.tolist(),
+                mz_maxs.tolist(),
+                precursor_mzs,
+                precursor_charges,
+            )
         )
-
-    return data
+    ]
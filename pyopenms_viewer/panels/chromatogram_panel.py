@@ -198,10 +198,11 @@ class ChromatogramPanel(BasePanel):
 
         # Plot each selected chromatogram
         for i, chrom_idx in enumerate(self.state.selected_chromatogram_indices):
-            if chrom_idx not in self.state.chromatogram_data:
+            chrom_arrays = self.state.get_chromatogram(chrom_idx)
+            if chrom_arrays is None:
                 continue
 
-            rt_array, int_array = self.state.chromatogram_data[chrom_idx]
+            rt_array, int_array = chrom_arrays
             display_rt = rt_array / rt_divisor
 
             # Find metadata for label
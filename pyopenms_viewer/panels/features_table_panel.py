@@ -6,6 +6,7 @@ with filtering and zoom-to-feature functionality.
 
 from typing import Callable, Optional
 
+import numpy as np
 from nicegui import ui
 
 from pyopenms_viewer.core.state import ViewerState
@@ -272,16 +273,12 @@ class FeaturesTablePanel(BasePanel):
             # Get feature bounds from ALL convex hulls or use defaults
             hulls = feature.getConvexHulls()
             if hulls:
-                all_points = []
-                for hull in hulls:
-                    points = hull.getHullPoints()
-                    all_points.extend([(p[0], p[1]) for p in points])
-
-                if all_points:
-                    rts = [p[0] for p in all_points]
-                    mzs = [p[1] for p in all_points]
-                    rt_min, rt_max = min(rts), max(rts)
-                    mz_min, mz_max = min(mzs), max(mzs)
+                # Hull points are (N, 2) arrays of (rt, mz)
+                all_points = np.concatenate([hull.getHullPoints() for hull in hulls])
+
+                if len(all_points):
+                    rt_min, mz_min = all_points.min(axis=0)
+                    rt_max, mz_max = all_points.max(axis=0)
                 else:
                     # Default zoom
                     rt_min, rt_max = rt - 10, rt + 10
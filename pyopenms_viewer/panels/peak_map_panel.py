@@ -1347,10 +1347,9 @@ class PeakMapPanel(BasePanel):
             if hulls and len(hulls) > 0:
                 hull_points = hulls[0].getHullPoints()
                 if len(hull_points) > 0:
-                    rt_vals = [p[0] for p in hull_points]
-                    mz_vals = [p[1] for p in hull_points]
-                    rt_min, rt_max = min(rt_vals), max(rt_vals)
-                    mz_min, mz_max = min(mz_vals), max(mz_vals)
+                    # Hull points are an (N, 2) array of (rt, mz)
+                    rt_min, mz_min = hull_points.min(axis=0)
+                    rt_max, mz_max = hull_points.max(axis=0)
                 else:
                     rt_min, rt_max = rt - 5, rt + 5
                     mz_min, mz_max = mz - 0.5, mz + 0.5
@@ -11,6 +11,7 @@ import plotly.graph_objects as go
 from nicegui import ui
 
 from pyopenms_viewer.annotation.spectrum_annotator import (
+    SpectrumAnnotationData,
     annotate_spectrum_with_id,
     compute_spectrum_annotation,
     create_annotated_spectrum_plot,
@@ -19,6 +20,7 @@ from pyopenms_viewer.annotation.spectrum_annotator import (
 from pyopenms_viewer.core.state import ViewerState
 from pyopenms_viewer.loaders.mzml_loader import get_cv_from_spectrum
 from pyopenms_viewer.panels.base_panel import BasePanel
+from pyopenms_viewer.utils.plot_utils import stem_arrays
 
 
 class SpectrumPanel(BasePanel):
@@ -37,6 +39,9 @@ class SpectrumPanel(BasePanel):
     # Maximum peaks to display before downsampling kicks in
     MAX_DISPLAY_PEAKS = 5000
 
+    # Annotated spectra kept for re-renders (zoom, mirror/unmatched toggles)
+    ANNOTATION_CACHE_SIZE = 32
+
     def __init__(self, state: ViewerState):
         """Initialize spectrum panel.
 
@@ -55,6 +60,9 @@ class SpectrumPanel(BasePanel):
         # References to external update callbacks
         self._on_spectrum_changed_callback: Optional[Callable] = None
 
+        # Computed annotations, least recently used first (see _get_annotation_data)
+        self._annotation_cache: dict[tuple, SpectrumAnnotationData] = {}
+
         # Plotly config (must be included in figure dict)
         self._plotly_config = {
             "modeBarButtonsToRemove": ["autoScale2d"],
@@ -374,7 +382,7 @@ class SpectrumPanel(BasePanel):
 
         # Choose intensity values based on display mode
         if self.state.spectrum_intensity_percent:
-            int_display = (int_display_raw / max_int) * 100
+            int_display = np.multiply(int_display_raw, 100.0 / max_int)
             y_title = "Relative Intensity (%)"
             hover_fmt = "m/z: %{x:.4f}<br>Intensity: %{y:.1f}%<extra></extra>"
             y_range = [0, 105]
@@ -392,11 +400,7 @@ class SpectrumPanel(BasePanel):
         color = "#00d4ff" if is_dark else "#000000"
 
         # Add spectrum as vertical lines (stem plot)
-        x_stems = []
-        y_stems = []
-        for mz, intensity in zip(mz_display, int_display):
-            x_stems.extend([mz, mz, None])
-            y_stems.extend([0, intensity, None])
+        x_stems, y_stems = stem_arrays(mz_display, int_display)
 
         fig.add_trace(
             go.Scatter(
@@ -538,26 +542,8 @@ class SpectrumPanel(BasePanel):
         # Compute annotation data
         annotation_data = None
         if self.state.annotate_peaks:
-            # First check for external peak annotations (from specialized tools like OpenNuXL)
-            external_annotations = get_external_peak_annotations_from_hit(
-                best_hit, mz_array, tolerance_da=self.state.annotation_tolerance_da
-            )
-
-            if not external_annotations:
-                # Check for annotations from SpectrumAnnotator
-                external_annotations = annotate_spectrum_with_id(
-                    spec, best_hit, tolerance_da=self.state.annotation_tolerance_da
-                )
-
-            # Compute annotation data
-            annotation_data = compute_spectrum_annotation(
-                exp_mz=mz_array,
-                exp_int=int_array,
-                sequence_str=sequence_str,
-                charge=charge,
-                precursor_mz=prec_mz,
-                tolerance_da=self.state.annotation_tolerance_da,
-                external_annotations=external_annotations if external_annotations else None,
+            annotation_data = self._get_annotation_data(
+                spec, mz_array, int_array, spectrum_idx, id_idx, best_hit, sequence_str, charge, prec_mz
             )
 
         # Create annotated spectrum plot
@@ -595,6 +581,76 @@ class SpectrumPanel(BasePanel):
 
         return fig
 
+    def _get_annotation_data(
+        self,
+        spec,
+        mz_array: np.ndarray,
+        int_array: np.ndarray,
+        spectrum_idx: int,
+        id_idx: int,
+        best_hit,
+        sequence_str: str,
+        charge: int,
+        prec_mz: float,
+    ) -> SpectrumAnnotationData:
+        """Get ion annotations for a spectrum, reusing the result across re-renders.
+
+        Zooming or toggling the mirror/unmatched views redraws the same spectrum,
+        so results are cached by spectrum, ID, tolerance and a fingerprint of
+        the peak m/z (the arrays from get_peaks() are fresh copies each time).
+        The cache is cleared whenever new spectra or IDs are loaded.
+
+        Args:
+            spec: pyOpenMS spectrum object
+            mz_array: Array of m/z values
+            int_array: Array of intensity values
+            spectrum_idx: Spectrum index
+            id_idx: Index of matching peptide ID
+            best_hit: PeptideHit to annotate
+            sequence_str: Peptide sequence of best_hit
+            charge: Charge of best_hit
+            prec_mz: Precursor m/z
+
+        Returns:
+            SpectrumAnnotationData for the spectrum
+        """
+        tolerance_da = self.state.annotation_tolerance_da
+        key = (
+            spectrum_idx,
+            id_idx,
+            sequence_str,
+            charge,
+            prec_mz,
+            tolerance_da,
+            len(mz_array),
+            mz_array[:1].tobytes(),
+            mz_array[-1:].tobytes(),
+        )
+        # Pop and re-insert so the dict stays in least-recently-used order
+        annotation_data = self._annotation_cache.pop(key, None)
+        if annotation_data is None:
+            # First check for external peak annotations (from specialized tools like OpenNuXL)
+            external_annotations = get_external_peak_annotations_from_hit(best_hit, mz_array, tolerance_da=tolerance_da)
+
+            if not external_annotations:
+                # Check for annotations from SpectrumAnnotator
+                external_annotations = annotate_spectrum_with_id(spec, best_hit, tolerance_da=tolerance_da)
+
+            annotation_data = compute_spectrum_annotation(
+                exp_mz=mz_array,
+                exp_int=int_array,
+                sequence_str=sequence_str,
+                charge=charge,
+                precursor_mz=prec_mz,
+                tolerance_da=tolerance_da,
+                external_annotations=external_annotations if external_annotations else None,
+            )
+            if len(self._annotation_cache) >= self.ANNOTATION_CACHE_SIZE:
+                del self._annotation_cache[next(iter(self._annotation_cache))]
+
+        self._annotation_cache[key] = annotation_data
+        return annotation_data
+
     def _add_measurements_to_figure(
         self, fig: go.Figure, spectrum_idx: int, mz_array: np.ndarray, int_array: np.ndarray
     ):
@@ -909,6 +965,10 @@ class SpectrumPanel(BasePanel):
 
     def _on_data_loaded(self, data_type: str):
         """Handle data loaded event."""
+        if data_type in ("mzml", "ids"):
+            # Cached annotations belong to the previous spectra/IDs
+            self._annotation_cache.clear()
+
         if data_type == "mzml":
             if self._has_data():
                 # Show first spectrum
@@ -1,5 +1,6 @@
 """Overlay rendering for features, IDs, and markers on peak maps."""
 
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
 from pyopenms_viewer.core.state import ViewerState
@@ -115,16 +116,12 @@ class OverlayRenderer:
             # Get feature bounds from convex hulls
             hulls = feature.getConvexHulls()
             if hulls:
-                all_points = []
-                for hull in hulls:
-                    points = hull.getHullPoints()
-                    all_points.extend([(p[0], p[1]) for p in points])
+                # Hull points are (N, 2) arrays of (rt, mz)
+                all_points = np.concatenate([hull.getHullPoints() for hull in hulls])
 
-                if all_points:
-                    rt_coords = [p[0] for p in all_points]
-                    mz_coords = [p[1] for p in all_points]
-                    feat_rt_min, feat_rt_max = min(rt_coords), max(rt_coords)
-                    feat_mz_min, feat_mz_max = min(mz_coords), max(mz_coords)
+                if len(all_points):
+                    feat_rt_min, feat_mz_min = all_points.min(axis=0)
+                    feat_rt_max, feat_mz_max = all_points.max(axis=0)
                 else:
                     feat_rt_min, feat_rt_max = rt - 1, rt + 1
                     feat_mz_min, feat_mz_max = mz - 0.5, mz + 0.5
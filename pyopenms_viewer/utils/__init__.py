@@ -1,5 +1,6 @@
 """Utility modules for coordinate transforms, filtering, etc."""
 
 from pyopenms_viewer.utils.coordinate_transform import CoordinateTransform
+from pyopenms_viewer.utils.plot_utils import stem_arrays
 
-__all__ = ["CoordinateTransform"]
+__all__ = ["CoordinateTransform", "stem_arrays"]
@@ -0,0 +1,29 @@
+"""Helpers for building Plotly trace data."""
+
+import numpy as np
+
+
+def stem_arrays(mz: np.ndarray, heights: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Build x/y arrays for a stem plot as (mz, 0) -> (mz, height) segments.
+
+    Segments are separated by NaN, which Plotly treats as a line break.
+    Heights are stored as float32, which halves their size in the figure
+    JSON (Plotly encodes NumPy arrays with their dtype); m/z stays float64.
+
+    Args:
+        mz: m/z value of each stem
+        heights: Height of each stem
+
+    Returns:
+        Tuple of (x, y) arrays with three entries per stem
+    """
+    n = len(mz)
+    x = np.empty(n * 3, dtype=np.float64)
+    x[0::3] = mz
+    x[1::3] = mz
+    x[2::3] = np.nan
+    y = np.empty(n * 3, dtype=np.float32)
+    y[0::3] = 0.0
+    y[1::3] = heights
+    y[2::3] = np.nan
+    return x, y
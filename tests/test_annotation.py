@@ -1,6 +1,7 @@
 """Tests for the pyopenms_viewer annotation module."""
 
 import numpy as np
+import pytest
 
 from pyopenms_viewer.annotation.spectrum_annotator import (
     MatchedIon,
@@ -9,8 +10,12 @@ from pyopenms_viewer.annotation.spectrum_annotator import (
     _format_charge_only,
     _get_ion_type,
     _parse_charge_string,
+    annotate_spectrum_with_id,
     compute_spectrum_annotation,
+    create_annotated_spectrum_plot,
     format_ion_label_with_superscript,
+    get_external_peak_annotations_from_hit,
+    parse_fragment_annotation_string,
 )
 from pyopenms_viewer.annotation.theoretical_spectrum import (
     TheoreticalIon,
@@ -278,6 +283,27 @@ class TestSpectrumAnnotationData:
         assert b_ions[0].ion_name == "b2"
         assert y_ions[0].ion_name == "y3"
 
+    def test_matched_arrays(self):
+        """Test the columnar view of matched ions and selecting by type."""
+        matched = [
+            MatchedIon(200.0, 1000, 50, 0, 200.01, 1.0, "b2", "b", -0.01),
+            MatchedIon(300.0, 2000, 100, 3, 300.02, 0.5, "y3", "y", -0.02),
+            MatchedIon(400.0, 500, 25, 5, 400.03, 0.8, "b4", "b", -0.03),
+        ]
+        data = SpectrumAnnotationData(
+            sequence="PEPTIDE", charge=2, precursor_mz=400.5, tolerance_da=0.05, matched_ions=matched
+        )
+
+        arrays = data.matched_arrays()
+        assert len(arrays) == 3
+        np.testing.assert_array_equal(arrays.exp_peak_idx, [0, 3, 5])
+        np.testing.assert_array_equal(arrays.theo_intensity, [1.0, 0.5, 0.8])
+
+        b_ions = arrays.select(arrays.ion_type == "b")
+        assert b_ions.ion_name.tolist() == ["b2", "b4"]
+        assert b_ions.formatted_name.tolist() == ["b<sub>2</sub>", "b<sub>4</sub>"]
+        np.testing.assert_array_equal(b_ions.exp_mz, [200.0, 400.0])
+
     def test_get_unmatched_by_type(self):
         """Test filtering unmatched ions by type."""
         unmatched = [
@@ -315,6 +341,7 @@ class TestComputeSpectrumAnnotation:
         assert result.sequence == "PEPTIDE"
         assert result.charge == 2
         assert len(result.matched_ions) == 0
+        assert len(result.unmatched_ions) == result.n_theoretical
 
     def test_invalid_sequence(self):
         """Test annotation with invalid sequence returns empty data."""
@@ -350,6 +377,196 @@ class TestComputeSpectrumAnnotation:
         assert result.n_theoretical > 0
         # Some ions should be matched
         assert result.n_matched >= 0
+        assert result.exp_int_pct.dtype == np.float32
+        assert result.exp_int_pct[3] == 100.0
+
+    def test_external_annotations(self):
+        """Test external annotations take the closest theoretical ion or fall back to the peak m/z."""
+        exp_mz = np.array([227.1, 425.2, 1500.0])
+        exp_int = np.array([200.0, 300.0, 100.0])
+        external = [(0, "b2", "b"), (1, "b4", "b"), (2, "x9", "x"), (7, "y1", "y")]
+
+        result = compute_spectrum_annotation(
+            exp_mz, exp_int, "PEPTIDE", 2, 400.5, tolerance_da=0.05, external_annotations=external
+        )
+
+        assert [ion.ion_name for ion in result.matched_ions] == ["b2", "b4", "x9"]
+        b2, b4, x9 = result.matched_ions
+        assert abs(b2.theo_mz - 227.1026) < 1e-3
+        assert abs(b4.mz_error - (425.2 - b4.theo_mz)) < 1e-9
+        assert x9.theo_mz == 1500.0
+        assert x9.mz_error == 0.0
+        assert len(result.unmatched_ions) == result.n_theoretical - 2
+
+    def test_matches_closest_peak_in_unsorted_spectrum(self):
+        """Test matching picks the nearest peak by original index when m/z is unsorted."""
+        from pyopenms import AASequence
+
+        theo = generate_theoretical_spectrum(AASequence.fromString("PEPTIDE"), 2)
+        rng = np.random.default_rng(0)
+        exp_mz = np.concatenate([[ion.mz + 0.02 for ion in theo.ions], rng.uniform(50, 800, 50)])
+        exp_mz = rng.permutation(exp_mz)
+        exp_int = rng.uniform(1, 100, len(exp_mz))
+
+        result = compute_spectrum_annotation(
+            exp_mz, exp_int, sequence_str="PEPTIDE", charge=2, precursor_mz=400.5, tolerance_da=0.05
+        )
+
+        assert result.n_matched == len(theo.ions)
+        assert result.unmatched_ions == []
+        for ion in result.matched_ions:
+            expected_idx = int(np.argmin(np.abs(exp_mz - ion.theo_mz)))
+            assert ion.exp_peak_idx == expected_idx
+            assert ion.exp_mz == exp_mz[expected_idx]
+            assert abs(ion.mz_error - (exp_mz[expected_idx] - ion.theo_mz)) < 1e-9
+
+
+class TestExternalPeakAnnotations:
+    """Tests for matching PeptideHit peak annotations to experimental peaks."""
+
+    def test_annotations_matched_to_closest_peak(self):
+        """Test annotations map to the closest peak within tolerance and others are dropped."""
+        from pyopenms import PeptideHit, PeptideHit_PeakAnnotation
+
+        hit = PeptideHit()
+        peak_annotations = []
+        for mz, name in [(300.02, "y3"), (99.0, "b1"), (200.0, "b2")]:
+            ann = PeptideHit_PeakAnnotation()
+            ann.mz = mz
+            ann.annotation = name
+            ann.charge = 1
+            peak_annotations.append(ann)
+        hit.setPeakAnnotations(peak_annotations)
+
+        exp_mz = np.array([500.0, 300.0, 200.01])
+        result = get_external_peak_annotations_from_hit(hit, exp_mz, tolerance_da=0.05)
+
+        assert result == [(1, "y3", "y"), (2, "b2", "b")]
+
+    def test_precursor_and_upper_case_ion_types(self):
+        """Test precursor names are typed "precursor" and upper-case names map to their ion series."""
+        from pyopenms import PeptideHit, PeptideHit_PeakAnnotation
+
+        hit = PeptideHit()
+        peak_annotations = []
+        for mz, name in [(100.0, "Y1"), (200.0, "B2"), (400.0, "[M+H]+"), (500.0, "precursor")]:
+            ann = PeptideHit_PeakAnnotation()
+            ann.mz = mz
+            ann.annotation = name
+            ann.charge = 1
+            peak_annotations.append(ann)
+        hit.setPeakAnnotations(peak_annotations)
+
+        exp_mz = np.array([100.0, 200.0, 400.0, 500.0])
+        result = get_external_peak_annotations_from_hit(hit, exp_mz, tolerance_da=0.05)
+
+        assert [ion_type for _, _, ion_type in result] == ["y", "b", "precursor", "precursor"]
+
+
+class TestParseFragmentAnnotationString:
+    """Tests for parsing "ion@mz" fragment annotation strings."""
+
+    def test_tokens_matched_to_closest_peak(self):
+        """Test comma/whitespace separated tokens map to peaks within 0.5 Da; malformed tokens are skipped."""
+        from pyopenms import MSSpectrum
+
+        spectrum = MSSpectrum()
+        spectrum.set_peaks(([100.0, 200.0, 300.0], [1.0, 1.0, 1.0]))
+
+        result = parse_fragment_annotation_string("y1@100.2, b2+2@200.3 junk a@b x3@1e5\ty2@299.6", spectrum)
+
+        assert result == [(0, "y1", "y"), (1, "b2+2", "b"), (2, "y2", "y")]
+
+    def test_empty_string(self):
+        """Test empty annotation string returns no annotations."""
+        from pyopenms import MSSpectrum
+
+        assert parse_fragment_annotation_string("", MSSpectrum()) == []
+
+
+class TestAnnotateSpectrumWithId:
+    """Tests for SpectrumAnnotator-based peak annotation."""
+
+    def test_annotates_every_theoretical_peak(self):
+        """Test each peak placed at a theoretical m/z is annotated with its ion type."""
+        from pyopenms import AASequence, MSSpectrum, PeptideHit
+
+        theo = generate_theoretical_spectrum(AASequence.fromString("PEPTIDE"), 2)
+        theo_mz = np.array(sorted(ion.mz for ion in theo.ions))
+        spectrum = MSSpectrum()
+        spectrum.set_peaks((theo_mz + 0.01, np.ones(len(theo_mz))))
+        hit = PeptideHit()
+        hit.setSequence(AASequence.fromString("PEPTIDE"))
+        hit.setCharge(2)
+
+        result = annotate_spectrum_with_id(spectrum, hit, tolerance_da=0.05)
+
+        assert [peak_idx for peak_idx, _, _ in result] == list(range(len(theo_mz)))
+        assert all(ion_type == ion_name[0] for _, ion_name, ion_type in result)
+
+    def test_precursor_peaks_typed_as_precursor(self, monkeypatch):
+        """Test SpectrumAnnotator precursor annotations ("[M+2H]++") are typed "precursor", not "unknown"."""
+        from pyopenms import AASequence, MSSpectrum, PeptideHit, TheoreticalSpectrumGenerator
+
+        from pyopenms_viewer.annotation import spectrum_annotator
+
+        tsg = TheoreticalSpectrumGenerator()
+        params = tsg.getParameters()
+        params.setValue("add_metainfo", "true")
+        params.setValue("add_precursor_peaks", "true")
+        tsg.setParameters(params)
+        monkeypatch.setattr(spectrum_annotator, "get_theoretical_spectrum_generator", lambda: tsg)
+
+        theo = MSSpectrum()
+        tsg.getSpectrum(theo, AASequence.fromString("PEPTIDE"), 1, 2)
+        spectrum = MSSpectrum()
+        spectrum.set_peaks((theo.get_peaks()[0], np.ones(theo.size())))
+        hit = PeptideHit()
+        hit.setSequence(AASequence.fromString("PEPTIDE"))
+        hit.setCharge(2)
+
+        result = annotate_spectrum_with_id(spectrum, hit, tolerance_da=0.05)
+
+        precursor = [(ion_name, ion_type) for _, ion_name, ion_type in result if ion_name.startswith("[M")]
+        assert precursor
+        assert all(ion_type == "precursor" for _, ion_type in precursor)
+
+    def test_empty_spectrum_or_sequence(self):
+        """Test empty spectra and hits without a sequence yield no annotations."""
+        from pyopenms import AASequence, MSSpectrum, PeptideHit
+
+        hit = PeptideHit()
+        hit.setSequence(AASequence.fromString("PEPTIDE"))
+        assert annotate_spectrum_with_id(MSSpectrum(), hit) == []
+
+        spectrum = MSSpectrum()
+        spectrum.set_peaks((np.array([98.06, 227.1]), np.array([1.0, 1.0])))
+        assert annotate_spectrum_with_id(spectrum, PeptideHit()) == []
+        assert annotate_spectrum_with_id(spectrum, None) == []
+
+
+class TestAnnotatedSpectrumPlot:
+    """Tests for the annotated spectrum figure."""
+
+    def test_experimental_stems_are_nan_separated(self):
+        """Test the experimental stem trace holds one NaN-separated segment per peak."""
+        exp_mz = np.array([98.06, 227.1, 324.16])
+        exp_int = np.array([50.0, 200.0, 100.0])
+        data = compute_spectrum_annotation(exp_mz, exp_int, "PEPTIDE", 2, 400.5, tolerance_da=0.1)
+
+        fig = create_annotated_spectrum_plot(
+            exp_mz, exp_int, "PEPTIDE", 2, 400.5, mirror_mode=True, annotation_data=data
+        )
+
+        stems = fig.data[0]
+        assert len(stems.x) == 9
+        np.testing.assert_array_equal(stems.x[0::3], exp_mz)
+        np.testing.assert_allclose(stems.y[1::3], [25.0, 100.0, 50.0], rtol=1e-6)
+        assert np.isnan(stems.x[2::3]).all()
+        assert np.isnan(stems.y[2::3]).all()
+        # m/z keeps full precision, heights are sent as float32
+        assert stems.x.dtype == np.float64
+        assert stems.y.dtype == np.float32
 
 
 class TestTheoreticalSpectrum:
@@ -441,6 +658,15 @@ class TestTickFormatter:
         label = format_tick_label(1500, 5000)
         assert label == "1500"
 
+    def test_format_tick_label_zero_and_numpy_values(self):
+        """Test zero is formatted independently of its sign and NumPy values are accepted."""
+        assert format_tick_label(-0.0, 50) == "0.0"
+        assert format_tick_label(0.0, 50) == "0.0"
+        assert format_tick_label(-0.0, 50) == "0.0"
+        assert format_tick_label(np.float32(15.5), 50) == "15.5"
+        assert format_tick_label(np.array(15.5), 50) == "15.5"
+        assert format_intensity(np.array(1500.0)) == "1.50e+03"
+
     def test_format_tick_label_medium_range(self):
         """Test tick label formatting for medium range."""
         label = format_tick_label(15.5, 50)
@@ -485,3 +711,94 @@ class TestTickFormatter:
         """Test intensity formatting in regular notation."""
         label = format_intensity(1234567.89, scientific=False)
         assert label == "1234568"
+
+
+class TestAnnotationExports:
+    """Tests for the lazily resolved annotation package exports."""
+
+    def test_lazy_exports(self):
+        """Test every name in __all__ resolves to its submodule function."""
+        import pyopenms_viewer.annotation as annotation
+
+        assert annotation.calculate_nice_ticks is calculate_nice_ticks
+        assert annotation.generate_theoretical_spectrum is generate_theoretical_spectrum
+        for name in annotation.__all__:
+            assert callable(getattr(annotation, name))
+
+
+class TestSpectrumPanelAnnotationCache:
+    """Tests for the spectrum panel's LRU cache of computed annotations."""
+
+    @pytest.fixture
+    def panel(self):
+        """Create a spectrum panel without building its UI."""
+        from pyopenms_viewer.core.state import ViewerState
+        from pyopenms_viewer.panels.spectrum_panel import SpectrumPanel
+
+        return SpectrumPanel(ViewerState())
+
+    @pytest.fixture
+    def spectrum(self):
+        """Create a small spectrum and a PEPTIDE hit to annotate it with."""
+        from pyopenms import AASequence, MSSpectrum, PeptideHit
+
+        spec = MSSpectrum()
+        spec.set_peaks(([98.06, 227.1, 324.16, 425.2], [100.0, 200.0, 150.0, 300.0]))
+        hit = PeptideHit()
+        hit.setSequence(AASequence.fromString("PEPTIDE"))
+        hit.setCharge(2)
+        return spec, hit
+
+    def annotate(self, panel, spectrum, spectrum_idx=0):
+        """Run the panel's cached annotation for ``spectrum`` at ``spectrum_idx``."""
+        spec, hit = spectrum
+        mz_array, int_array = spec.get_peaks()
+        return panel._get_annotation_data(spec, mz_array, int_array, spectrum_idx, 0, hit, "PEPTIDE", 2, 400.5)
+
+    def test_repeat_call_is_cached(self, panel, spectrum):
+        """Annotating the same spectrum again returns the cached object."""
+        first = self.annotate(panel, spectrum)
+
+        assert self.annotate(panel, spectrum) is first
+        assert len(panel._annotation_cache) == 1
+
+    def test_tolerance_change_misses(self, panel, spectrum):
+        """Changing the annotation tolerance recomputes the annotation."""
+        first = self.annotate(panel, spectrum)
+        panel.state.annotation_tolerance_da *= 2
+
+        assert self.annotate(panel, spectrum) is not first
+        assert len(panel._annotation_cache) == 2
+
+    def test_oldest_entry_evicted(self, panel, spectrum):
+        """One more distinct key than the cache holds evicts the least recently used entry."""
+        size = panel.ANNOTATION_CACHE_SIZE
+        first = self.annotate(panel, spectrum, spectrum_idx=0)
+        for idx in range(1, size):
+            self.annotate(panel, spectrum, spectrum_idx=idx)
+        assert len(panel._annotation_cache) == size
+
+        self.annotate(panel, spectrum, spectrum_idx=size)
+
+        assert len(panel._annotation_cache) == size
+        assert [key[0] for key in panel._annotation_cache] == list(range(1, size + 1))
+        assert self.annotate(panel, spectrum, spectrum_idx=0) is not first
+
+    def test_recently_used_entry_kept(self, panel, spectrum):
+        """A cache hit moves the entry to the back so it is not evicted next."""
+        first = self.annotate(panel, spectrum, spectrum_idx=0)
+        for idx in range(1, panel.ANNOTATION_CACHE_SIZE):
+            self.annotate(panel, spectrum, spectrum_idx=idx)
+        self.annotate(panel, spectrum, spectrum_idx=0)
+
+        self.annotate(panel, spectrum, spectrum_idx=panel.ANNOTATION_CACHE_SIZE)
+
+        assert self.annotate(panel, spectrum, spectrum_idx=0) is first
+
+    def test_loading_ids_clears_cache(self, panel, spectrum):
+        """Loading new IDs empties the cache."""
+        first = self.annotate(panel, spectrum)
+        panel._on_data_loaded("ids")
+
+        assert panel._annotation_cache == {}
+        assert self.annotate(panel, spectrum) is not first
@@ -561,3 +561,15 @@ class TestStateFAIMS:
         state = ViewerState()
         assert state.faims_data == {}
         assert isinstance(state.faims_data, dict)
+
+
+class TestPackageExports:
+    """Tests for the lazily resolved package-level exports."""
+
+    def test_lazy_exports(self):
+        """Test package-level names resolve to the core objects."""
+        import pyopenms_viewer
+
+        assert pyopenms_viewer.ViewerState is ViewerState
+        assert pyopenms_viewer.EventBus is EventBus
+        assert set(pyopenms_viewer.__all__) <= set(dir(pyopenms_viewer))
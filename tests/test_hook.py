@@ -0,0 +1,304 @@
+"""Tests for the PyInstaller hooks shipped at the repository root."""
+
+import importlib.machinery
+import importlib.util
+import os
+import runpy
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="module")
+def hook():
+    """Load hook-pyopenms.py as a module, bypassing its on-disk cache."""
+    pytest.importorskip("PyInstaller")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("PYOPENMS_HOOK_NO_CACHE", "1")
+        spec = importlib.util.spec_from_file_location("hook_pyopenms", REPO_ROOT / "hook-pyopenms.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return module
+
+
+def make_tree(root, *paths):
+    """Create empty files at the given relative paths below ``root``."""
+    for rel in paths:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+    return root
+
+
+def rel_sources(root, entries):
+    """Return the sorted source paths of ``(src, dest)`` entries relative to ``root``."""
+    return sorted(Path(src).relative_to(root).as_posix() for src, _dest in entries)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX shared library naming")
+class TestExtensionModules:
+    """Tests for telling extension modules apart from shared libraries."""
+
+    def test_tagged_suffixes_are_modules(self, hook, tmp_path):
+        """Tagged .so files in a package are hidden imports, not binaries."""
+        make_tree(tmp_path, "pkg/__init__.py", "pkg/_a.abi3.so", "pkg/_b" + importlib.machinery.EXTENSION_SUFFIXES[0])
+        _datas, binaries, hiddenimports, extension_modules = hook.collect_pyopenms_files(str(tmp_path / "pkg"), "pkg")
+
+        assert sorted(extension_modules) == ["pkg._a", "pkg._b"]
+        assert hiddenimports == ["pkg"]
+        assert binaries == []
+
+    def test_plain_so_is_library_only(self, hook, tmp_path):
+        """Bare .so files (libOpenMS.so) are binaries and never hidden imports."""
+        make_tree(tmp_path, "pkg/__init__.py", "pkg/libOpenMS.so", "pkg/libOpenMS.so.3")
+        _datas, binaries, hiddenimports, extension_modules = hook.collect_pyopenms_files(str(tmp_path / "pkg"), "pkg")
+
+        assert rel_sources(tmp_path, binaries) == ["pkg/libOpenMS.so", "pkg/libOpenMS.so.3"]
+        assert extension_modules == []
+        assert hiddenimports == ["pkg"]
+
+    def test_extension_outside_package_is_binary(self, hook, tmp_path):
+        """Extension modules in a non-package directory cannot be imported and ship as binaries."""
+        make_tree(tmp_path, "pkg/__init__.py", "pkg/libs/_c.abi3.so")
+        _datas, binaries, _hiddenimports, extension_modules = hook.collect_pyopenms_files(str(tmp_path / "pkg"), "pkg")
+
+        assert rel_sources(tmp_path, binaries) == ["pkg/libs/_c.abi3.so"]
+        assert extension_modules == []
+
+
+class TestScan:
+    """Tests for the single-pass directory walk."""
+
+    def test_package_and_non_package_dirs(self, hook, tmp_path):
+        """Only directories with an __init__.py below a package yield hidden imports."""
+        make_tree(
+            tmp_path,
+            "pkg/__init__.py",
+            "pkg/a.py",
+            "pkg/sub/__init__.py",
+            "pkg/sub/b.py",
+            "pkg/scripts/run.py",
+            "pkg/scripts/inner/__init__.py",
+        )
+        datas, _binaries, hiddenimports, _ext = hook._scan(str(tmp_path / "pkg"), "pkg", "pkg")
+
+        assert sorted(hiddenimports) == ["pkg", "pkg.a", "pkg.sub", "pkg.sub.b"]
+        assert rel_sources(tmp_path, datas) == ["pkg/scripts/inner/__init__.py", "pkg/scripts/run.py"]
+
+    def test_non_identifier_py_is_data(self, hook, tmp_path):
+        """A .py file whose name is not a module name is collected as data."""
+        make_tree(tmp_path, "pkg/__init__.py", "pkg/my-script.py", "pkg/my-dir/__init__.py")
+        datas, _binaries, hiddenimports, _ext = hook._scan(str(tmp_path / "pkg"), "pkg", "pkg")
+
+        assert hiddenimports == ["pkg"]
+        assert rel_sources(tmp_path, datas) == ["pkg/my-dir/__init__.py", "pkg/my-script.py"]
+
+    def test_destinations_mirror_layout(self, hook, tmp_path):
+        """Entries are placed under the destination root at their relative directory."""
+        make_tree(tmp_path, "pkg/__init__.py", "pkg/data/table.csv")
+        datas, _binaries, _hiddenimports, _ext = hook._scan(str(tmp_path / "pkg"), "pkg", "pkg")
+
+        assert datas == [(str(tmp_path / "pkg" / "data" / "table.csv"), "pkg/data")]
+
+    def test_pruned_dirs_are_skipped(self, hook, tmp_path):
+        """__pycache__, tests and dist-info directories are not collected."""
+        make_tree(
+            tmp_path,
+            "pkg/__init__.py",
+            "pkg/__pycache__/a.cpython.pyc",
+            "pkg/tests/test_a.py",
+            "pkg/x.dist-info/RECORD",
+        )
+        datas, binaries, hiddenimports, _ext = hook._scan(str(tmp_path / "pkg"), "pkg", "pkg")
+
+        assert (datas, binaries, hiddenimports) == ([], [], ["pkg"])
+
+    @pytest.mark.skipif(os.name == "nt", reason="POSIX shared library naming")
+    def test_versioned_so_is_binary(self, hook, tmp_path):
+        """Versioned shared libraries are binaries, other numeric suffixes are data."""
+        make_tree(tmp_path, "pkg/__init__.py", "pkg/libfoo.so.1.2", "pkg/notes.txt.1")
+        datas, binaries, _hiddenimports, _ext = hook._scan(str(tmp_path / "pkg"), "pkg", "pkg")
+
+        assert rel_sources(tmp_path, binaries) == ["pkg/libfoo.so.1.2"]
+        assert rel_sources(tmp_path, datas) == ["pkg/notes.txt.1"]
+
+    @pytest.mark.skipif(os.name == "nt", reason="DLLs are binaries on Windows")
+    def test_managed_dlls_under_share_are_data(self, hook, tmp_path):
+        """Managed .NET assemblies under share are plain data off Windows."""
+        make_tree(
+            tmp_path,
+            "pkg/__init__.py",
+            "pkg/_core.abi3.so",
+            "pkg/share/OpenMS/openms_thermo_bridge/managed/ThermoFisher.dll",
+        )
+        datas, binaries, hiddenimports, extension_modules = hook.collect_pyopenms_files(str(tmp_path / "pkg"), "pkg")
+
+        assert rel_sources(tmp_path, datas) == ["pkg/share/OpenMS/openms_thermo_bridge/managed/ThermoFisher.dll"]
+        assert datas[0][1] == "pkg/share/OpenMS/openms_thermo_bridge/managed"
+        assert binaries == []
+        assert hiddenimports == ["pkg"]
+        assert extension_modules == ["pkg._core"]
+
+
+class TestCollect:
+    """Tests for assembling the hook output and the collect_all fallback."""
+
+    @pytest.fixture
+    def collect_all_calls(self, hook, monkeypatch):
+        """Replace collect_all and copy_metadata in the hook and record collect_all calls."""
+        calls = []
+
+        def fake_collect_all(package):
+            calls.append(package)
+            return ["collect_all datas"], [], []
+
+        monkeypatch.setattr(hook, "collect_all", fake_collect_all)
+        monkeypatch.setattr(hook, "copy_metadata", lambda package: [])
+        return calls
+
+    def test_fallback_without_binaries(self, hook, tmp_path, collect_all_calls):
+        """A package with neither binaries nor extension modules falls back to collect_all."""
+        make_tree(tmp_path, "pkg/__init__.py", "pkg/a.py")
+
+        assert hook._collect("pkg", str(tmp_path / "pkg"), False) == (["collect_all datas"], [], [])
+        assert collect_all_calls == ["pkg"]
+
+    @pytest.mark.skipif(os.name == "nt", reason="POSIX shared library naming")
+    def test_no_fallback_with_extension_modules(self, hook, tmp_path, collect_all_calls):
+        """Extension modules alone are enough to trust the walk."""
+        make_tree(tmp_path, "pkg/__init__.py", "pkg/_core.abi3.so")
+        (tmp_path / "pkg" / "__init__.py").write_text("from ._core import *\nimport pkg.extra\n")
+
+        datas, binaries, hiddenimports = hook._collect("pkg", str(tmp_path / "pkg"), False)
+
+        assert collect_all_calls == []
+        assert binaries == []
+        assert hiddenimports == ["pkg._core", "pkg", "pkg.extra"]
+
+    def test_use_collect_all(self, hook, tmp_path, collect_all_calls):
+        """use_collect_all skips the walk entirely."""
+        hook._collect("pkg", str(tmp_path), True)
+
+        assert collect_all_calls == ["pkg"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX shared library naming")
+class TestGather:
+    """Tests for the on-disk cache around the collected lists."""
+
+    @pytest.fixture
+    def pkg_dir(self, hook, tmp_path, monkeypatch):
+        """A synthetic package that get_package_paths resolves to, with the cache under tmp_path."""
+        pkg_dir = make_tree(tmp_path, "pkg/__init__.py", "pkg/libcore.so") / "pkg"
+        monkeypatch.setattr(hook, "get_package_paths", lambda package: (str(tmp_path), str(pkg_dir)))
+        monkeypatch.setattr(hook, "copy_metadata", lambda package: [])
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        monkeypatch.delenv("PYOPENMS_HOOK_NO_CACHE", raising=False)
+        return str(pkg_dir)
+
+    def test_cache_path(self, hook, pkg_dir, tmp_path):
+        """The cache file lives under XDG_CACHE_HOME and depends on the collection mode."""
+        path = hook._cache_path("pkg", pkg_dir, False)
+
+        assert Path(path).parent == tmp_path / "cache" / "pyinstaller-hooks"
+        assert Path(path).name.startswith("pkg-unknown-")
+        assert path.endswith(".pkl")
+        assert path == hook._cache_path("pkg", pkg_dir, False)
+        assert path != hook._cache_path("pkg", pkg_dir, True)
+
+    def test_gather_uses_cache(self, hook, pkg_dir, monkeypatch):
+        """The second gather() is served from the cache without walking the package."""
+        first = hook.gather("pkg")
+
+        assert os.path.isfile(hook._cache_path("pkg", pkg_dir, False))
+        monkeypatch.setattr(hook, "_collect", lambda *args: pytest.fail("cache not used"))
+        assert hook.gather("pkg") == first
+
+    def test_gather_no_cache(self, hook, pkg_dir, monkeypatch):
+        """PYOPENMS_HOOK_NO_CACHE bypasses both reading and writing the cache."""
+        monkeypatch.setenv("PYOPENMS_HOOK_NO_CACHE", "1")
+        datas, binaries, hiddenimports = hook.gather("pkg")
+
+        assert rel_sources(Path(pkg_dir).parent, binaries) == ["pkg/libcore.so"]
+        assert hiddenimports == ["pkg"]
+        assert not os.path.exists(hook._cache_path("pkg", pkg_dir, False))
+
+    def test_corrupt_cache_is_rebuilt(self, hook, pkg_dir):
+        """An unreadable cache file is ignored and overwritten."""
+        cache_path = hook._cache_path("pkg", pkg_dir, False)
+        os.makedirs(os.path.dirname(cache_path))
+        with open(cache_path, "wb") as fh:
+            fh.write(b"not a pickle")
+
+        datas, binaries, hiddenimports = hook.gather("pkg")
+
+        assert hiddenimports == ["pkg"]
+        assert hook.gather("pkg") == (datas, binaries, hiddenimports)
+
+    def test_stale_pickle_is_rebuilt(self, hook, pkg_dir):
+        """A cache referencing objects that no longer exist is rebuilt, leaving no temporary files."""
+        cache_path = hook._cache_path("pkg", pkg_dir, False)
+        os.makedirs(os.path.dirname(cache_path))
+        with open(cache_path, "wb") as fh:
+            # Unpickling this raises ModuleNotFoundError rather than UnpicklingError
+            fh.write(b"cno_such_module\nThing\n.")
+
+        result = hook.gather("pkg")
+
+        assert result[2] == ["pkg"]
+        assert os.listdir(os.path.dirname(cache_path)) == [os.path.basename(cache_path)]
+
+
+class TestRuntimeHook:
+    """Tests for the Windows DLL directory registration in pyi_rth_pyopenms.py."""
+
+    def run_hook(self, monkeypatch, add_dll_directory):
+        """Run the runtime hook as if frozen on Windows and return its globals."""
+        monkeypatch.setattr(sys, "platform", "win32")
+        monkeypatch.setattr(sys, "_MEIPASS", "C:\\bundle", raising=False)
+        monkeypatch.setattr(os, "add_dll_directory", add_dll_directory, raising=False)
+        return runpy.run_path(str(REPO_ROOT / "pyi_rth_pyopenms.py"))
+
+    def test_registers_bundle_dirs(self, monkeypatch):
+        """Every bundle DLL directory is registered in order and its handle kept."""
+        registered = []
+
+        def add_dll_directory(path):
+            registered.append(path)
+            return f"handle:{path}"
+
+        result = self.run_hook(monkeypatch, add_dll_directory)
+
+        assert registered == [
+            "C:\\bundle",
+            "C:\\bundle\\pyopenms",
+            "C:\\bundle\\pyopenms\\Qt6\\bin",
+            "C:\\bundle\\pyopenms\\Qt6\\plugins\\platforms",
+            "C:\\bundle\\pyopenms\\share",
+        ]
+        assert result["_dll_directory_handles"] == [f"handle:{path}" for path in registered]
+
+    def test_missing_dir_is_skipped(self, monkeypatch):
+        """An OSError for one directory is swallowed and the others are still registered."""
+
+        def add_dll_directory(path):
+            if path.endswith("\\Qt6\\bin"):
+                raise FileNotFoundError(path)
+            return path
+
+        result = self.run_hook(monkeypatch, add_dll_directory)
+
+        assert len(result["_dll_directory_handles"]) == 4
+        assert "C:\\bundle\\pyopenms\\Qt6\\bin" not in result["_dll_directory_handles"]
+
+    def test_noop_off_windows(self, monkeypatch):
+        """Nothing is registered on other platforms."""
+        monkeypatch.setattr(sys, "platform", "linux")
+        monkeypatch.setattr(os, "add_dll_directory", lambda path: pytest.fail("called"), raising=False)
+
+        result = runpy.run_path(str(REPO_ROOT / "pyi_rth_pyopenms.py"))
+
+        assert result["_dll_directory_handles"] == []
@@ -2,12 +2,17 @@
 
 from pathlib import Path
 
+import numpy as np
+from pyopenms import DriftTimeUnit, MSChromatogram, MSExperiment, MSSpectrum
+
 from pyopenms_viewer.core.state import ViewerState
 from pyopenms_viewer.loaders import (
     FeatureLoader,
     IDLoader,
     MzMLLoader,
     extract_chromatograms,
+    extract_ion_mobility_data,
+    get_cv_from_spectrum,
 )
 
 # Test data paths
@@ -18,6 +23,21 @@ BSA_IDXML = TEST_DATA_DIR / "BSA1_F1.idXML"
 IMS_MZML = TEST_DATA_DIR / "ims_example.mzML"
 
 
+def make_faims_experiment(cvs=(-45.0, -60.0), n_per_cv=5, n_peaks=10):
+    """Build an in-memory MS1 experiment cycling through the given FAIMS CVs."""
+    exp = MSExperiment()
+    for i in range(n_per_cv * len(cvs)):
+        spec = MSSpectrum()
+        spec.setRT(float(i))
+        spec.setMSLevel(1)
+        mz = np.linspace(100.0, 1000.0, n_peaks)
+        spec.set_peaks((mz, np.full(n_peaks, 10.0 * (i + 1), dtype=np.float32)))
+        spec.setDriftTimeUnit(DriftTimeUnit.FAIMS_COMPENSATION_VOLTAGE)
+        spec.setDriftTime(cvs[i % len(cvs)])
+        exp.addSpectrum(spec)
+    return exp
+
+
 class TestMzMLLoader:
     """Tests for mzML file loading."""
 
@@ -118,6 +138,139 @@ class TestIMSLoading:
         assert state.im_min < state.im_max
         assert state.im_min >= 0
 
+    def test_load_ims_mzml_float32_columns(self):
+        """Test that IM peak columns are stored as float32."""
+        assert IMS_MZML.exists(), f"Test file not found: {IMS_MZML}"
+        state = ViewerState()
+        loader = MzMLLoader(state)
+        loader.load_sync(str(IMS_MZML))
+        for col in ("mz", "im", "intensity", "log_intensity"):
+            assert state.im_df[col].dtype == np.float32
+
+    def test_extract_ion_mobility_data_counts_peaks_when_not_given(self):
+        """Test standalone IM extraction matches the loader, which passes the MS1 peak total."""
+        assert IMS_MZML.exists(), f"Test file not found: {IMS_MZML}"
+        state = ViewerState()
+        MzMLLoader(state).load_sync(str(IMS_MZML))
+        loaded_mz = state.im_df["mz"].to_numpy()
+
+        standalone = ViewerState()
+        standalone.exp = state.exp
+        extract_ion_mobility_data(standalone)
+        np.testing.assert_array_equal(standalone.im_df["mz"].to_numpy(), loaded_mz)
+
+
+class TestFAIMSLoading:
+    """Tests for FAIMS compensation voltage handling."""
+
+    def test_faims_cvs_detected(self):
+        """Test that multiple CVs are detected during peak extraction."""
+        state = ViewerState()
+        state.exp = make_faims_experiment()
+        assert MzMLLoader(state).process("faims.mzML")
+        assert state.has_faims is True
+        assert state.faims_cvs == [-60.0, -45.0]
+
+    def test_faims_peak_cvs_and_tic(self):
+        """Test per-peak CV column and per-CV TIC."""
+        state = ViewerState()
+        state.exp = make_faims_experiment(n_per_cv=5, n_peaks=10)
+        MzMLLoader(state).process("faims.mzML")
+        assert (state.df["cv"] == -45.0).sum() == 50
+        assert (state.df["cv"] == -60.0).sum() == 50
+        for cv in state.faims_cvs:
+            cv_rt, cv_int = state.faims_tic[cv]
+            assert len(cv_rt) == 5
+            assert np.all(np.diff(cv_rt) > 0)
+        # Spectrum i has 10 peaks of intensity 10 * (i + 1); CV -45 holds the even spectra
+        np.testing.assert_allclose(state.faims_tic[-45.0][1], [100 * (i + 1) for i in range(0, 10, 2)])
+
+    def test_faims_data_split_per_cv(self):
+        """Test per-CV DataFrames are keyed by the exact CV values."""
+        state = ViewerState()
+        state.exp = make_faims_experiment(cvs=(-45.3, -60.7), n_per_cv=3, n_peaks=4)
+        MzMLLoader(state).process("faims.mzML")
+        assert list(state.faims_data) == state.faims_cvs == [-60.7, -45.3]
+        for cv_df in state.faims_data.values():
+            assert len(cv_df) == 12
+            assert cv_df["cv"].nunique() == 1
+
+    def test_faims_cv_query_with_data_manager(self, tmp_path):
+        """Test per-CV queries against the categorical cv column in both storage modes."""
+        for out_of_core in (False, True):
+            state = ViewerState()
+            state.init_data_manager(out_of_core=out_of_core, cache_dir=tmp_path)
+            state.exp = make_faims_experiment(cvs=(-45.3, -60.7), n_per_cv=3, n_peaks=4)
+            MzMLLoader(state).process("faims.mzML")
+            for cv in state.faims_cvs:
+                cv_df = state.data_manager.query_peaks_for_cv(cv=cv, downsample=False)
+                assert len(cv_df) == 12
+
+    def test_faims_cvs_from_acquisition_info(self):
+        """Test CVs stored only in the acquisition info of later spectra are found."""
+        from pyopenms import Acquisition, AcquisitionInfo
+
+        state = ViewerState()
+        state.exp = MSExperiment()
+        for i, cv in enumerate((None, -45.0, -60.0, -45.0)):
+            spec = MSSpectrum()
+            spec.setRT(float(i))
+            spec.setMSLevel(1)
+            spec.set_peaks((np.array([100.0, 200.0]), np.array([1.0, 2.0], dtype=np.float32)))
+            if cv is not None:
+                acquisition = Acquisition()
+                acquisition.setMetaValue("FAIMS compensation voltage", cv)
+                info = AcquisitionInfo()
+                info.push_back(acquisition)
+                spec.setAcquisitionInfo(info)
+            state.exp.addSpectrum(spec)
+
+        assert MzMLLoader(state).process("faims.mzML")
+        assert state.has_faims is True
+        assert state.faims_cvs == [-60.0, -45.0]
+
+    def test_single_cv_is_not_faims(self):
+        """Test that a single CV does not enable FAIMS mode."""
+        state = ViewerState()
+        state.exp = make_faims_experiment(cvs=(-45.0,))
+        MzMLLoader(state).process("faims.mzML")
+        assert state.has_faims is False
+        assert "cv" not in state.df.columns
+
+
+class TestGetCVFromSpectrum:
+    """Tests for FAIMS CV lookup from spectrum metadata."""
+
+    def test_cv_from_meta_value(self):
+        """Test CV fallback to metadata names, including after another name matched."""
+        for name in ("MS:1001581", "FAIMS compensation voltage", "MS:1001581"):
+            spec = MSSpectrum()
+            spec.setMetaValue(name, -55.0)
+            assert get_cv_from_spectrum(spec) == -55.0
+
+    def test_meta_name_preference_not_shared_between_loads(self):
+        """Test a metadata name preferred while loading one file does not leak into later lookups."""
+        state = ViewerState()
+        state.exp = MSExperiment()
+        for i, cv in enumerate((-45.0, -60.0)):
+            spec = MSSpectrum()
+            spec.setRT(float(i))
+            spec.setMSLevel(1)
+            spec.set_peaks((np.array([100.0]), np.array([1.0], dtype=np.float32)))
+            spec.setMetaValue("MS:1001581", cv)
+            state.exp.addSpectrum(spec)
+        MzMLLoader(state).process("faims.mzML")
+        assert state.faims_cvs == [-60.0, -45.0]
+
+        spec = MSSpectrum()
+        spec.setMetaValue("FAIMS compensation voltage", -30.0)
+        spec.setMetaValue("MS:1001581", -70.0)
+        assert get_cv_from_spectrum(spec) == -30.0
+
+    def test_no_cv(self):
+        """Test that spectra without CV information return None."""
+        assert get_cv_from_spectrum(MSSpectrum()) is None
+
 
 class TestChromatogramExtraction:
     """Tests for chromatogram extraction."""
@@ -133,6 +286,24 @@ class TestChromatogramExtraction:
         assert isinstance(state.chromatograms, list)
         assert isinstance(state.chromatogram_data, dict)
 
+    def test_chromatogram_lookup(self):
+        """Test per-chromatogram arrays are sliced from the shared arrays."""
+        state = ViewerState()
+        state.exp = MSExperiment()
+        for n_points in (3, 0, 5):
+            chrom = MSChromatogram()
+            chrom.setNativeID(f"chrom_{n_points}")
+            chrom.set_peaks((np.arange(n_points, dtype=float), np.full(n_points, float(n_points))))
+            state.exp.addChromatogram(chrom)
+        extract_chromatograms(state)
+        assert [c["idx"] for c in state.chromatograms] == [0, 2]
+        rt, intensity = state.get_chromatogram(2)
+        np.testing.assert_array_equal(rt, np.arange(5))
+        np.testing.assert_array_equal(intensity, np.full(5, 5.0))
+        assert len(state.get_chromatogram(0)[0]) == 3
+        assert state.get_chromatogram(1) is None
+        assert state.get_chromatogram(3) is None
+
 
 class TestFeatureLoader:
     """Tests for featureXML file loading."""
@@ -1,9 +1,11 @@
 """Tests for the pyopenms_viewer rendering module."""
 
+import numpy as np
 import pytest
 
 from pyopenms_viewer.core.state import ViewerState
 from pyopenms_viewer.utils.coordinate_transform import CoordinateTransform
+from pyopenms_viewer.utils.plot_utils import stem_arrays
 
 
 class TestCoordinateTransform:
@@ -340,3 +342,23 @@ class TestCoordinateTransformDimensions:
         rt, mz = transform.pixel_to_data(state, pixel_x=100, pixel_y=50)
         assert rt == pytest.approx(0.0, abs=0.1)
         assert mz == pytest.approx(500.0, abs=0.1)
+
+
+class TestStemArrays:
+    """Tests for stem plot trace data."""
+
+    def test_nan_separated_segments(self):
+        """Test each stem is a (mz, 0) -> (mz, height) segment followed by a NaN break."""
+        x, y = stem_arrays(np.array([100.5, 200.25]), np.array([10.0, 50.0]))
+        np.testing.assert_array_equal(x[[0, 1, 3, 4]], [100.5, 100.5, 200.25, 200.25])
+        np.testing.assert_array_equal(y[[0, 1, 3, 4]], [0.0, 10.0, 0.0, 50.0])
+        assert np.isnan(x[2::3]).all()
+        assert np.isnan(y[2::3]).all()
+        assert x.dtype == np.float64
+        assert y.dtype == np.float32
+
+    def test_empty(self):
+        """Test no stems give empty arrays."""
+        x, y = stem_arrays(np.array([]), np.array([]))
+        assert len(x) == 0
+        assert len(y) == 0